@@ -0,0 +1,21 @@
+"""add dataset columnar_path
+
+Revision ID: 0005_add_dataset_columnar_path
+Revises: 0004_add_cleaning_job_created_at
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_add_dataset_columnar_path"
+down_revision = "0004_add_cleaning_job_created_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("datasets", sa.Column("columnar_path", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("datasets", "columnar_path")
@@ -0,0 +1,27 @@
+"""add content_hash to datasets and validation_results
+
+Revision ID: 0006_add_content_hash
+Revises: 0005_add_dataset_columnar_path
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_add_content_hash"
+down_revision = "0005_add_dataset_columnar_path"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("datasets", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index("ix_datasets_content_hash", "datasets", ["content_hash"], unique=False)
+    op.add_column("validation_results", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index("ix_validation_results_content_hash", "validation_results", ["content_hash"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_validation_results_content_hash", table_name="validation_results")
+    op.drop_column("validation_results", "content_hash")
+    op.drop_index("ix_datasets_content_hash", table_name="datasets")
+    op.drop_column("datasets", "content_hash")
@@ -0,0 +1,24 @@
+"""add metrics_json to validation_results and cleaning_jobs
+
+Revision ID: 0007_add_metrics_json
+Revises: 0006_add_content_hash
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007_add_metrics_json"
+down_revision = "0006_add_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("validation_results", sa.Column("metrics_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column("cleaning_jobs", sa.Column("metrics_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("cleaning_jobs", "metrics_json")
+    op.drop_column("validation_results", "metrics_json")
@@ -0,0 +1,50 @@
+"""add denormalized issue counts to validation_results
+
+Revision ID: 0008_add_issue_counts
+Revises: 0007_add_metrics_json
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0008_add_issue_counts"
+down_revision = "0007_add_metrics_json"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "validation_results",
+        sa.Column("issues_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "validation_results",
+        sa.Column(
+            "issue_type_counts",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE validation_results
+        SET issues_count = jsonb_array_length(issues_json),
+            issue_type_counts = (
+                SELECT COALESCE(jsonb_object_agg(issue_type, n), '{}'::jsonb)
+                FROM (
+                    SELECT COALESCE(issue ->> 'type', 'issue') AS issue_type, count(*) AS n
+                    FROM jsonb_array_elements(issues_json) AS issue
+                    GROUP BY 1
+                ) AS counts
+            )
+        WHERE jsonb_typeof(issues_json) = 'array'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("validation_results", "issue_type_counts")
+    op.drop_column("validation_results", "issues_count")
@@ -0,0 +1,65 @@
+"""add per-dataset composite indexes and datasets.latest_result_id
+
+Revision ID: 0009_add_dataset_indexes
+Revises: 0008_add_issue_counts
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009_add_dataset_indexes"
+down_revision = "0008_add_issue_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_validation_results_dataset_id_created_at",
+        "validation_results",
+        ["dataset_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_cleaning_jobs_dataset_id_created_at",
+        "cleaning_jobs",
+        ["dataset_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_datasets_owner_id_upload_time",
+        "datasets",
+        ["owner_id", sa.text("upload_time DESC")],
+        unique=False,
+    )
+
+    op.add_column("datasets", sa.Column("latest_result_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "fk_datasets_latest_result_id",
+        "datasets",
+        "validation_results",
+        ["latest_result_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.execute(
+        """
+        UPDATE datasets
+        SET latest_result_id = latest.id
+        FROM (
+            SELECT DISTINCT ON (dataset_id) dataset_id, id
+            FROM validation_results
+            ORDER BY dataset_id, created_at DESC
+        ) AS latest
+        WHERE latest.dataset_id = datasets.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_datasets_latest_result_id", "datasets", type_="foreignkey")
+    op.drop_column("datasets", "latest_result_id")
+    op.drop_index("ix_datasets_owner_id_upload_time", table_name="datasets")
+    op.drop_index("ix_cleaning_jobs_dataset_id_created_at", table_name="cleaning_jobs")
+    op.drop_index("ix_validation_results_dataset_id_created_at", table_name="validation_results")
@@ -0,0 +1,24 @@
+"""add content_version to validation_results
+
+Revision ID: 0010_add_result_content_version
+Revises: 0009_add_dataset_indexes
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_add_result_content_version"
+down_revision = "0009_add_dataset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "validation_results",
+        sa.Column("content_version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("validation_results", "content_version")
@@ -0,0 +1,22 @@
+"""add analysis_fingerprint to validation_results
+
+Revision ID: 0011_add_analysis_fingerprint
+Revises: 0010_add_result_content_version
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_add_analysis_fingerprint"
+down_revision = "0010_add_result_content_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing results have no fingerprint, so they are never reused; new analyses replace them.
+    op.add_column("validation_results", sa.Column("analysis_fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("validation_results", "analysis_fingerprint")
@@ -1,13 +1,12 @@
-import csv
-import io
 import os
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from uuid import UUID
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
-import pandas as pd
-from fpdf import FPDF
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, load_only
 
 from app.api.deps import get_current_user, get_db
 from app.core.config import get_settings
@@ -15,11 +14,22 @@ from app.models.cleaning_job import CleaningJob
 from app.models.dataset import Dataset
 from app.models.validation_result import ValidationResult
 from app.schemas.cleaning import CleaningJobOut
-from app.schemas.dataset import DatasetOut, DatasetPreviewOut, ValidationHistoryOut, ValidationResultOut
-from app.services.cleaning import apply_cleaning_plan
-from app.services.llm import generate_cleaning_plan, summarize_issues
-from app.services.processing import run_validation
-from app.tasks.jobs import clean_dataset_task, process_dataset_task
+from app.schemas.dataset import (
+    DatasetOut,
+    DatasetPreviewOut,
+    DatasetRowsOut,
+    ValidationHistoryOut,
+    ValidationResultOut,
+)
+from app.services.ingestion import ALLOWED_EXTENSIONS, CSV_EXTENSIONS, file_extension, read_columns, read_row_range
+from app.services.llm import generate_cleaning_plan, summarize_and_plan_async
+from app.services.preview import ensure_preview, load_preview
+from app.services.processing import clean_and_revalidate, prepare_dataset, run_validation
+from app.services.reports import MEDIA_TYPES, cached_report, report_etag, report_path
+from app.services.rowindex import load_row_index
+from app.services.results import find_reusable_result, record_validation_result, reuse_validation_result
+from app.services.workers import PoolSaturated, get_analysis_pool
+from app.tasks.jobs import clean_dataset_task, prepare_dataset_task, process_dataset_task
 from app.utils.files import save_upload_file
 
 settings = get_settings()
@@ -27,16 +37,32 @@ settings = get_settings()
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Analysis workers are busy, retry shortly",
+        headers={"Retry-After": str(settings.analysis_retry_after_seconds)},
+    )
+
+
+def _run_analysis(fn, *args):
+    try:
+        return get_analysis_pool().run(fn, *args)
+    except PoolSaturated:
+        raise _busy()
+
+
 @router.post("/upload", response_model=DatasetOut)
 def upload_dataset(
+    response: Response,
     file: UploadFile = File(...),
     process: bool = True,
     async_process: bool = False,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    if not file.filename or not file.filename.lower().endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+    if not file.filename or file_extension(file.filename) not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Only CSV, Parquet and Feather files are allowed")
 
     file.file.seek(0, os.SEEK_END)
     size = file.file.tell()
@@ -44,37 +70,69 @@ def upload_dataset(
     if size > settings.max_upload_bytes:
         raise HTTPException(status_code=400, detail="File exceeds size limit")
 
-    file_path = save_upload_file(settings.upload_dir, file)
+    file_path, content_hash = save_upload_file(settings.upload_dir, file)
+    pool = get_analysis_pool()
+    # A saturated pool does not reject uploads: the schema, row index, columnar copy
+    # and preview are built by Celery instead, either as part of processing (202)
+    # or by a prepare-only task when no processing is queued.
+    saturated = False
+    columnar_path = None
+    try:
+        columnar_path = pool.run(prepare_dataset, file_path)
+    except PoolSaturated:
+        saturated = True
 
     dataset = Dataset(
         filename=file.filename,
         owner_id=current_user.id,
         status="uploaded",
         file_path=file_path,
+        columnar_path=columnar_path,
+        content_hash=content_hash,
     )
     db.add(dataset)
     db.commit()
     db.refresh(dataset)
 
-    if process and async_process:
-        dataset.status = "processing"
-        db.commit()
-        process_dataset_task.delay(str(dataset.id))
-        return dataset
+    if process and not async_process:
+        existing = find_reusable_result(db, content_hash)
+        if existing:
+            reuse_validation_result(db, dataset, existing)
+            dataset.status = "done"
+            db.commit()
+            if saturated:
+                prepare_dataset_task.delay(str(dataset.id))
+            return dataset
+        validation = None
+        if not saturated:
+            try:
+                validation = pool.run(run_validation, dataset.analysis_path)
+            except PoolSaturated:
+                pass
+        if validation is not None:
+            profile, issues, score, llm_summary, cleaning_plan, metrics = validation
+            record_validation_result(
+                db,
+                dataset,
+                profile,
+                issues,
+                score,
+                llm_summary,
+                cleaning_plan,
+                content_hash=content_hash,
+                metrics=metrics,
+            )
+            dataset.status = "done"
+            db.commit()
+            return dataset
+        response.status_code = 202
 
     if process:
-        profile, issues, score, llm_summary, cleaning_plan = run_validation(file_path, use_llm=False)
-        dataset.status = "done"
-        result = ValidationResult(
-            dataset_id=dataset.id,
-            quality_score=score,
-            issues_json=issues,
-            profile_json=profile,
-            llm_summary=llm_summary,
-            cleaning_plan_json=cleaning_plan,
-        )
-        db.add(result)
+        dataset.status = "processing"
         db.commit()
+        process_dataset_task.delay(str(dataset.id))
+    elif saturated:
+        prepare_dataset_task.delay(str(dataset.id))
 
     return dataset
 
@@ -122,17 +180,19 @@ def process_dataset(
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    profile, issues, score, llm_summary, cleaning_plan = run_validation(dataset.file_path, use_llm=False)
+    profile, issues, score, llm_summary, cleaning_plan, metrics = _run_analysis(run_validation, dataset.analysis_path)
     dataset.status = "done"
-    result = ValidationResult(
-        dataset_id=dataset.id,
-        quality_score=score,
-        issues_json=issues,
-        profile_json=profile,
-        llm_summary=llm_summary,
-        cleaning_plan_json=cleaning_plan,
+    result = record_validation_result(
+        db,
+        dataset,
+        profile,
+        issues,
+        score,
+        llm_summary,
+        cleaning_plan,
+        content_hash=dataset.content_hash,
+        metrics=metrics,
     )
-    db.add(result)
     db.commit()
     db.refresh(result)
     return result
@@ -159,42 +219,24 @@ def process_dataset_async(
 
 
 @router.post("/{dataset_id}/explain", response_model=ValidationResultOut)
-def explain_dataset(
+async def explain_dataset(
     dataset_id: UUID,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    dataset = (
-        db.query(Dataset)
-        .filter(Dataset.id == dataset_id, Dataset.owner_id == current_user.id)
-        .first()
-    )
-    if not dataset:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    # Database work stays in the threadpool; the LLM requests are awaited on the
+    # event loop so slow Gemini responses do not hold a worker thread.
+    result = await run_in_threadpool(get_latest_report, dataset_id, db, current_user)
 
-    result = (
-        db.query(ValidationResult)
-        .filter(ValidationResult.dataset_id == dataset.id)
-        .order_by(ValidationResult.created_at.desc())
-        .first()
-    )
-    if not result:
-        raise HTTPException(status_code=404, detail="No report found")
-
-    result.llm_summary = summarize_issues(result.issues_json)
-    result.cleaning_plan_json = generate_cleaning_plan(result.issues_json)
+    result.llm_summary, result.cleaning_plan_json = await summarize_and_plan_async(result.issues_json)
 
-    db.commit()
-    db.refresh(result)
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(db.refresh, result)
     return result
 
 
-@router.post("/{dataset_id}/clean", response_model=CleaningJobOut)
-def clean_dataset(
-    dataset_id: UUID,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-):
+def _cleaning_source(dataset_id: UUID, db: Session, current_user) -> tuple[Dataset, ValidationResult | None]:
+    """The dataset to clean and its report, reusing one of identical content when it has none."""
     dataset = (
         db.query(Dataset)
         .filter(Dataset.id == dataset_id, Dataset.owner_id == current_user.id)
@@ -203,67 +245,103 @@ def clean_dataset(
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    result = (
-        db.query(ValidationResult)
-        .filter(ValidationResult.dataset_id == dataset.id)
-        .order_by(ValidationResult.created_at.desc())
-        .first()
-    )
+    result = dataset.latest_result
     if not result:
-        profile, issues, score, llm_summary, cleaning_plan = run_validation(dataset.file_path, use_llm=False)
-        result = ValidationResult(
-            dataset_id=dataset.id,
-            quality_score=score,
-            issues_json=issues,
-            profile_json=profile,
-            llm_summary=llm_summary,
-            cleaning_plan_json=cleaning_plan,
-        )
-        db.add(result)
-        db.commit()
-        db.refresh(result)
+        existing = find_reusable_result(db, dataset.content_hash)
+        if existing:
+            result = reuse_validation_result(db, dataset, existing)
+            db.commit()
+            db.refresh(result)
+            db.refresh(dataset)
+    return dataset, result
+
+
+def _record_source_result(db: Session, dataset: Dataset, validation: tuple) -> ValidationResult:
+    profile, issues, score, llm_summary, cleaning_plan, metrics = validation
+    result = record_validation_result(
+        db,
+        dataset,
+        profile,
+        issues,
+        score,
+        llm_summary,
+        cleaning_plan,
+        content_hash=dataset.content_hash,
+        metrics=metrics,
+    )
+    db.commit()
+    db.refresh(result)
+    db.refresh(dataset)
+    return result
 
+
+def _start_cleaning_job(db: Session, dataset: Dataset, result: ValidationResult) -> tuple[CleaningJob, Future]:
     if not result.cleaning_plan_json:
         result.cleaning_plan_json = generate_cleaning_plan(result.issues_json)
         db.commit()
         db.refresh(result)
 
+    # The source report only describes the cleaned input if it was computed for this content.
+    describes_source = bool(result.content_hash) and result.content_hash == dataset.content_hash
+    try:
+        future = get_analysis_pool().submit(
+            clean_and_revalidate,
+            dataset.analysis_path,
+            result.cleaning_plan_json,
+            settings.cleaned_dir,
+            result.profile_json if describes_source else None,
+            result.issues_json if describes_source else None,
+        )
+    except PoolSaturated:
+        raise _busy()
+
     job = CleaningJob(dataset_id=dataset.id, status="processing")
     db.add(job)
     db.commit()
     db.refresh(job)
+    return job, future
 
-    try:
-        cleaned_path = apply_cleaning_plan(
-            dataset.file_path,
-            result.cleaning_plan_json,
-            settings.cleaned_dir,
-        )
-        job.cleaned_file_path = cleaned_path
-        job.status = "done"
-        job.completed_at = datetime.now(timezone.utc)
-        db.commit()
 
-        profile, issues, score, llm_summary, cleaning_plan = run_validation(
-            cleaned_path,
-            use_llm=False,
-        )
-        cleaned_result = ValidationResult(
-            dataset_id=dataset.id,
-            quality_score=score,
-            issues_json=issues,
-            profile_json=profile,
-            llm_summary=llm_summary,
-            cleaning_plan_json=cleaning_plan,
-        )
-        db.add(cleaned_result)
-        dataset.status = "done"
-        db.commit()
-    except Exception:
+def _finish_cleaning_job(db: Session, dataset: Dataset, job: CleaningJob, outcome: tuple | None) -> None:
+    if outcome is None:
         job.status = "failed"
         db.commit()
-        raise
+        return
+    cleaned_path, profile, issues, score, metrics = outcome
+    job.cleaned_file_path = cleaned_path
+    job.status = "done"
+    job.completed_at = datetime.now(timezone.utc)
+    job.metrics_json = metrics
+    record_validation_result(db, dataset, profile, issues, score, metrics=metrics)
+    dataset.status = "done"
+    db.commit()
+    db.refresh(job)
 
+
+@router.post("/{dataset_id}/clean", response_model=CleaningJobOut)
+async def clean_dataset(
+    dataset_id: UUID,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    # Database and LLM work stays in the threadpool; analysis and cleaning run in the
+    # worker pool and are awaited, so no request thread waits for them.
+    dataset, result = await run_in_threadpool(_cleaning_source, dataset_id, db, current_user)
+    if not result:
+        try:
+            validation = await get_analysis_pool().run_async(run_validation, dataset.analysis_path)
+        except PoolSaturated:
+            raise _busy()
+        result = await run_in_threadpool(_record_source_result, db, dataset, validation)
+
+    job, future = await run_in_threadpool(_start_cleaning_job, db, dataset, result)
+    try:
+        outcome = await get_analysis_pool().result_async(future)
+    except BaseException:
+        # Includes cancellation: the job must not stay "processing" once nobody will record it.
+        await run_in_threadpool(_finish_cleaning_job, db, dataset, job, None)
+        raise
+    await run_in_threadpool(_finish_cleaning_job, db, dataset, job, outcome)
     return job
 
 
@@ -342,12 +420,7 @@ def download_cleaned_file(
     return FileResponse(job.cleaned_file_path, filename=filename)
 
 
-@router.get("/{dataset_id}/report", response_model=ValidationResultOut)
-def get_latest_report(
-    dataset_id: UUID,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-):
+def _latest_result(dataset_id: UUID, db: Session, current_user, options=()) -> tuple[Dataset, ValidationResult]:
     dataset = (
         db.query(Dataset)
         .filter(Dataset.id == dataset_id, Dataset.owner_id == current_user.id)
@@ -356,137 +429,145 @@ def get_latest_report(
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
-    result = (
-        db.query(ValidationResult)
-        .filter(ValidationResult.dataset_id == dataset.id)
-        .order_by(ValidationResult.created_at.desc())
-        .first()
-    )
+    result = None
+    if dataset.latest_result_id is not None:
+        result = db.get(ValidationResult, dataset.latest_result_id, options=list(options))
     if not result:
         raise HTTPException(status_code=404, detail="No report found")
-    return result
+    return dataset, result
+
+
+@router.get("/{dataset_id}/report", response_model=ValidationResultOut)
+def get_latest_report(
+    dataset_id: UUID,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return _latest_result(dataset_id, db, current_user)[1]
+
+
+def _report_export(dataset_id: UUID, fmt: str, if_none_match: str | None, db: Session, current_user) -> Response:
+    """Serve an export rendered once per result version, with a strong ETag."""
+    # The ETag needs only the id and version, so conditional requests never load the
+    # issue and profile blobs.
+    dataset, result = _latest_result(
+        dataset_id,
+        db,
+        current_user,
+        options=[load_only(ValidationResult.id, ValidationResult.content_version)],
+    )
+    etag = report_etag(result, fmt)
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    if not os.path.exists(report_path(result, fmt, settings.report_dir)):
+        result = db.get(ValidationResult, result.id, populate_existing=True)
+        etag = report_etag(result, fmt)
+    path = cached_report(result, fmt, dataset.filename, settings.report_dir)
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[fmt],
+        filename=f"report-{dataset_id}.{fmt}",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
 
 
 @router.get("/{dataset_id}/report.json")
 def download_report_json(
     dataset_id: UUID,
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    result = get_latest_report(dataset_id, db, current_user)
-    content = {
-        "dataset_id": str(result.dataset_id),
-        "quality_score": result.quality_score,
-        "issues": result.issues_json,
-        "profile": result.profile_json,
-        "llm_summary": result.llm_summary,
-        "cleaning_plan": result.cleaning_plan_json,
-        "created_at": result.created_at.isoformat(),
-    }
-    return JSONResponse(
-        content=content,
-        headers={"Content-Disposition": f"attachment; filename=report-{dataset_id}.json"},
-    )
+    return _report_export(dataset_id, "json", if_none_match, db, current_user)
 
 
 @router.get("/{dataset_id}/report.csv")
 def download_report_csv(
     dataset_id: UUID,
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    result = get_latest_report(dataset_id, db, current_user)
-
-    output = io.StringIO()
-    writer = csv.DictWriter(
-        output,
-        fieldnames=["type", "message", "column", "count", "null_pct"],
-    )
-    writer.writeheader()
-
-    issues = result.issues_json or []
-    if not issues:
-        writer.writerow({"type": "none", "message": "No issues detected"})
-    else:
-        for issue in issues:
-            writer.writerow({
-                "type": issue.get("type"),
-                "message": issue.get("message"),
-                "column": issue.get("column"),
-                "count": issue.get("count"),
-                "null_pct": issue.get("null_pct"),
-            })
-
-    output.seek(0)
-    headers = {"Content-Disposition": f"attachment; filename=report-{dataset_id}.csv"}
-    return StreamingResponse(output, media_type="text/csv", headers=headers)
+    return _report_export(dataset_id, "csv", if_none_match, db, current_user)
 
 
 @router.get("/{dataset_id}/report.pdf")
 def download_report_pdf(
     dataset_id: UUID,
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    result = get_latest_report(dataset_id, db, current_user)
+    return _report_export(dataset_id, "pdf", if_none_match, db, current_user)
+
 
+@router.get("/{dataset_id}/preview", response_model=DatasetPreviewOut)
+def preview_dataset(
+    dataset_id: UUID,
+    limit: int = 5,
+    offset: int = 0,
+    columns: str | None = None,
+    sample: bool = False,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
     dataset = (
         db.query(Dataset)
         .filter(Dataset.id == dataset_id, Dataset.owner_id == current_user.id)
         .first()
     )
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    if not os.path.exists(dataset.analysis_path):
+        raise HTTPException(status_code=404, detail="Dataset file missing")
 
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=12)
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.cell(0, 10, "Data Quality Report", ln=True)
-
-    pdf.set_font("Helvetica", size=11)
-    pdf.cell(0, 8, f"Dataset: {dataset.filename if dataset else dataset_id}", ln=True)
-    pdf.cell(0, 8, f"Created at: {result.created_at.isoformat()}", ln=True)
-    pdf.cell(0, 8, f"Quality score: {result.quality_score}", ln=True)
-    pdf.cell(0, 8, f"Issues count: {len(result.issues_json or [])}", ln=True)
-    pdf.ln(4)
-
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 8, "Summary", ln=True)
-    pdf.set_font("Helvetica", size=10)
-    summary = result.llm_summary or "No LLM summary available."
-    pdf.multi_cell(0, 6, summary)
-    pdf.ln(2)
-
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 8, "Issues", ln=True)
-    pdf.set_font("Helvetica", size=10)
-    if not result.issues_json:
-        pdf.multi_cell(0, 6, "No issues detected.")
-    else:
-        for issue in result.issues_json[:25]:
-            line = f"- {issue.get('type', 'issue')}: {issue.get('message', '')}"
-            pdf.multi_cell(0, 6, line)
-    pdf.ln(2)
-
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 8, "Cleaning Plan", ln=True)
-    pdf.set_font("Helvetica", size=10)
-    plan = result.cleaning_plan_json or {}
-    steps = plan.get("steps", []) if isinstance(plan, dict) else []
-    if not steps:
-        pdf.multi_cell(0, 6, "No cleaning plan available.")
+    preview = load_preview(dataset.analysis_path)
+    if preview is None:
+        # Datasets uploaded before preview artifacts existed get theirs built once here.
+        _run_analysis(
+            ensure_preview,
+            dataset.analysis_path,
+            settings.preview_head_rows,
+            settings.preview_sample_rows,
+            settings.stream_chunk_rows,
+        )
+        preview = load_preview(dataset.analysis_path)
+        if preview is None:
+            raise HTTPException(status_code=500, detail="Preview could not be built")
+
+    position_of = {col: i for i, col in enumerate(preview["columns"])}
+    selected = preview["columns"]
+    if columns:
+        selected = [col.strip() for col in columns.split(",") if col.strip()]
+        unknown = [col for col in selected if col not in position_of]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    positions = [position_of[col] for col in selected]
+
+    source = preview["sample"] if sample else preview["head"]
+    safe_offset = max(0, offset)
+    safe_limit = max(1, min(limit, len(source) or 1))
+    window = source[safe_offset:safe_offset + safe_limit]
+    if sample:
+        row_numbers = preview["sample_row_numbers"][safe_offset:safe_offset + safe_limit]
     else:
-        for step in steps[:20]:
-            pdf.multi_cell(0, 6, f"- {step.get('action')}: {step.get('details')}")
-
-    pdf_bytes = pdf.output(dest="S").encode("latin-1")
-    headers = {"Content-Disposition": f"attachment; filename=report-{dataset_id}.pdf"}
-    return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
+        row_numbers = list(range(safe_offset, safe_offset + len(window)))
+    return DatasetPreviewOut(
+        columns=selected,
+        rows=[{col: row[pos] for col, pos in zip(selected, positions)} for row in window],
+        row_numbers=row_numbers,
+        total_rows=preview["rows"],
+        sampled=sample,
+    )
 
 
-@router.get("/{dataset_id}/preview", response_model=DatasetPreviewOut)
-def preview_dataset(
+@router.get("/{dataset_id}/rows", response_model=DatasetRowsOut)
+def get_dataset_rows(
     dataset_id: UUID,
-    limit: int = 5,
+    offset: int = 0,
+    limit: int = 100,
+    columns: str | None = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -497,21 +578,52 @@ def preview_dataset(
     )
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
-    if not os.path.exists(dataset.file_path):
+
+    # An indexed CSV upload seeks to exact rows; otherwise page the columnar copy by row group.
+    index = None
+    path = dataset.analysis_path
+    if file_extension(dataset.file_path) in CSV_EXTENSIONS:
+        index = load_row_index(dataset.file_path)
+        if index is not None:
+            path = dataset.file_path
+    if not os.path.exists(path):
         raise HTTPException(status_code=404, detail="Dataset file missing")
 
-    safe_limit = max(1, min(limit, 20))
-    df = pd.read_csv(dataset.file_path, nrows=safe_limit)
-    return DatasetPreviewOut(columns=df.columns.tolist(), rows=df.to_dict(orient="records"))
+    selected = None
+    if columns:
+        selected = [col.strip() for col in columns.split(",") if col.strip()]
+        unknown = set(selected) - set(read_columns(path))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(sorted(unknown))}")
+
+    safe_offset = max(0, offset)
+    safe_limit = max(1, min(limit, 1000))
+    df = read_row_range(path, safe_offset, safe_offset + safe_limit, columns=selected)
+    if selected:
+        df = df[selected]
+    preview = load_preview(dataset.analysis_path)
+    total_rows = index.rows if index is not None else (preview["rows"] if preview else None)
+    return DatasetRowsOut(
+        columns=df.columns.tolist(),
+        rows=df.astype(object).where(df.notna(), None).to_dict(orient="records"),
+        offset=safe_offset,
+        total_rows=total_rows,
+    )
 
 
 @router.get("/{dataset_id}/history", response_model=list[ValidationHistoryOut])
 def get_dataset_history(
     dataset_id: UUID,
     limit: int = 12,
+    before: UUID | None = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    """Validation history, oldest first.
+
+    Pass the ``id`` of the oldest entry as ``before`` to page further back; only the
+    lightweight columns are selected, never the issue and profile blobs.
+    """
     dataset = (
         db.query(Dataset)
         .filter(Dataset.id == dataset_id, Dataset.owner_id == current_user.id)
@@ -520,21 +632,30 @@ def get_dataset_history(
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
+    query = db.query(
+        ValidationResult.id,
+        ValidationResult.quality_score,
+        ValidationResult.issues_count,
+        ValidationResult.issue_type_counts,
+        ValidationResult.created_at,
+    ).filter(ValidationResult.dataset_id == dataset.id)
+    if before is not None:
+        cursor = (
+            db.query(ValidationResult.created_at)
+            .filter(ValidationResult.id == before, ValidationResult.dataset_id == dataset.id)
+            .first()
+        )
+        if not cursor:
+            raise HTTPException(status_code=400, detail="Unknown history cursor")
+        # Keyset on (created_at, id) so results sharing a timestamp are neither skipped nor repeated.
+        query = query.filter(
+            tuple_(ValidationResult.created_at, ValidationResult.id) < (cursor.created_at, before)
+        )
+
     safe_limit = max(1, min(limit, 50))
     results = (
-        db.query(ValidationResult)
-        .filter(ValidationResult.dataset_id == dataset.id)
-        .order_by(ValidationResult.created_at.desc())
+        query.order_by(ValidationResult.created_at.desc(), ValidationResult.id.desc())
         .limit(safe_limit)
         .all()
     )
-    history = [
-        ValidationHistoryOut(
-            id=item.id,
-            quality_score=item.quality_score,
-            issues_count=len(item.issues_json or []),
-            created_at=item.created_at,
-        )
-        for item in reversed(results)
-    ]
-    return history
+    return list(reversed(results))
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -15,15 +15,47 @@ class Settings(BaseSettings):
     redis_url: str = "redis://redis:6379/0"
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "redis://redis:6379/1"
+    celery_metrics_port: Optional[int] = None
 
     max_upload_mb: int = 25
     upload_dir: str = "/app/uploads"
     cleaned_dir: str = "/app/cleaned"
+    report_dir: str = "/app/reports"
+    columnar_storage: bool = True
+    infer_dtypes: bool = True
+    dtype_sample_rows: int = 50_000
+    preview_head_rows: int = 100
+    preview_sample_rows: int = 100
+    stream_threshold_mb: int = 100
+    stream_chunk_rows: int = 100_000
+    approximate_duplicates: bool = False
+    hll_precision: int = 14
+    outlier_mode: Literal["sigma", "mad", "iqr"] = "sigma"
+    analysis_workers: int = 2
+    analysis_max_pending: int = 4
+    analysis_retry_after_seconds: int = 5
+    column_workers: int = 4
+    validation_rules: str = "all"
+    parallel_min_columns: int = 64
 
     llm_provider: str = "gemini"
     gemini_api_key: Optional[str] = None
     gemini_model: str = "gemini-2.0-flash"
     gemini_fallback_model: str = "gemini-1.5-flash"
+    llm_hedge_delay_seconds: float = 2.0
+    llm_requests_per_minute: int = 60
+    llm_tokens_per_minute: int = 1_000_000
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_reset_seconds: float = 30.0
+    llm_http2: bool = True
+    llm_timeout_seconds: float = 30.0
+    llm_connect_timeout_seconds: float = 5.0
+    llm_pool_max_connections: int = 20
+    llm_pool_max_keepalive: int = 10
+    llm_keepalive_expiry_seconds: float = 60.0
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 1024
 
     cors_origins: str = "http://localhost:5173,http://127.0.0.1:5173"
 
@@ -35,6 +67,16 @@ class Settings(BaseSettings):
     def max_upload_bytes(self) -> int:
         return self.max_upload_mb * 1024 * 1024
 
+    @property
+    def stream_threshold_bytes(self) -> int:
+        return self.stream_threshold_mb * 1024 * 1024
+
+    @property
+    def validation_rules_list(self) -> list[str] | None:
+        if self.validation_rules.strip().lower() == "all":
+            return None
+        return [rule.strip() for rule in self.validation_rules.split(",") if rule.strip()]
+
     @property
     def cors_origins_list(self) -> list[str]:
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
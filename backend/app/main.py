@@ -1,14 +1,19 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 # Ensure all SQLAlchemy models are registered before first query
 import app.models  # noqa: F401
 
 from app.api.routes.health import router as health_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.auth import router as auth_router
 from app.api.routes.datasets import router as datasets_router
 from app.api.routes.users import router as users_router
 from app.core.config import get_settings
+from app.services.http_client import close_async_http_client, close_http_client
+from app.services.parallel import shutdown_column_workers
+from app.services.workers import shutdown_analysis_pool
 from app.utils.files import ensure_dir
 
 settings = get_settings()
@@ -24,6 +29,7 @@ app.add_middleware(
 )
 
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(datasets_router)
@@ -33,3 +39,12 @@ app.include_router(datasets_router)
 def startup_event():
     ensure_dir(settings.upload_dir)
     ensure_dir(settings.cleaned_dir)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    close_http_client()
+    await close_async_http_client()
+    # Both wait for in-flight jobs, which must not stall the event loop.
+    await run_in_threadpool(shutdown_analysis_pool)
+    await run_in_threadpool(shutdown_column_workers)
@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -16,5 +16,9 @@ class CleaningJob(Base):
     cleaned_file_path = Column(Text, nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(String(32), default="pending", index=True, nullable=False)
+    metrics_json = Column(JSONB, nullable=True)
 
     dataset = relationship("Dataset", back_populates="cleaning_jobs")
+
+
+Index("ix_cleaning_jobs_dataset_id_created_at", CleaningJob.dataset_id, CleaningJob.created_at.desc())
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -16,7 +16,28 @@ class Dataset(Base):
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     status = Column(String(32), default="uploaded", index=True, nullable=False)
     file_path = Column(Text, nullable=False)
+    columnar_path = Column(Text, nullable=True)
+    content_hash = Column(String(64), index=True, nullable=True)
+    # Points at the newest ValidationResult so "latest report" is a primary-key fetch.
+    latest_result_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("validation_results.id", use_alter=True, name="fk_datasets_latest_result_id", ondelete="SET NULL"),
+        nullable=True,
+    )
 
     owner = relationship("User", back_populates="datasets")
-    validation_results = relationship("ValidationResult", back_populates="dataset")
+    validation_results = relationship(
+        "ValidationResult",
+        back_populates="dataset",
+        foreign_keys="ValidationResult.dataset_id",
+    )
+    # post_update: the result row must exist before the dataset can point at it.
+    latest_result = relationship("ValidationResult", foreign_keys=[latest_result_id], post_update=True)
     cleaning_jobs = relationship("CleaningJob", back_populates="dataset")
+
+    @property
+    def analysis_path(self) -> str:
+        return self.columnar_path or self.file_path
+
+
+Index("ix_datasets_owner_id_upload_time", Dataset.owner_id, Dataset.upload_time.desc())
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -14,9 +14,22 @@ class ValidationResult(Base):
     dataset_id = Column(UUID(as_uuid=True), ForeignKey("datasets.id"), nullable=False)
     quality_score = Column(Integer, nullable=False)
     issues_json = Column(JSONB, nullable=False)
+    # Denormalized from issues_json so history queries need not load the blob.
+    issues_count = Column(Integer, server_default="0", nullable=False)
+    issue_type_counts = Column(JSONB, server_default="{}", nullable=False)
     profile_json = Column(JSONB, nullable=False)
     llm_summary = Column(Text, nullable=True)
     cleaning_plan_json = Column(JSONB, nullable=True)
+    content_hash = Column(String(64), index=True, nullable=True)
+    # Code version and settings the analysis ran with; only matching results are reused.
+    analysis_fingerprint = Column(String(64), nullable=True)
+    metrics_json = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Bumped by every UPDATE of the row (e.g. /explain rewriting the summary); report
+    # exports are cached and tagged per version.
+    content_version = Column(Integer, server_default="1", onupdate=text("content_version + 1"), nullable=False)
 
-    dataset = relationship("Dataset", back_populates="validation_results")
+    dataset = relationship("Dataset", back_populates="validation_results", foreign_keys=[dataset_id])
+
+
+Index("ix_validation_results_dataset_id_created_at", ValidationResult.dataset_id, ValidationResult.created_at.desc())
@@ -10,6 +10,7 @@ class CleaningJobOut(BaseModel):
     created_at: datetime | None = None
     cleaned_file_path: str | None = None
     completed_at: datetime | None = None
+    metrics_json: dict | None = None
 
     class Config:
         from_attributes = True
@@ -22,6 +22,7 @@ class ValidationResultOut(BaseModel):
     profile_json: dict
     llm_summary: str | None = None
     cleaning_plan_json: dict | None = None
+    metrics_json: dict | None = None
     created_at: datetime
 
     class Config:
@@ -32,6 +33,7 @@ class ValidationHistoryOut(BaseModel):
     id: UUID
     quality_score: int
     issues_count: int
+    issue_type_counts: dict[str, int] = {}
     created_at: datetime
 
     class Config:
@@ -41,3 +43,14 @@ class ValidationHistoryOut(BaseModel):
 class DatasetPreviewOut(BaseModel):
     columns: list[str]
     rows: list[dict]
+    # 0-based positions of ``rows`` in the dataset.
+    row_numbers: list[int] = []
+    total_rows: int | None = None
+    sampled: bool = False
+
+
+class DatasetRowsOut(BaseModel):
+    columns: list[str]
+    rows: list[dict]
+    offset: int
+    total_rows: int | None = None
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any, Protocol
+
+import numpy as np
+import pandas as pd
+
+from app.services.ingestion import read_frame
+from app.services.outliers import count_outliers, numeric_matrix, outlier_bounds
+from app.services.schema import is_text_dtype
+
+PK_CANDIDATES = {"id", "pk", "primary_key"}
+LONG_STRING_CHARS = 255
+
+
+def count_long_strings(series: pd.Series) -> int:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Measure each category once and look the lengths up by code.
+        long = np.append(series.cat.categories.astype(str).str.len().to_numpy() > LONG_STRING_CHARS, False)
+        return int(long[series.cat.codes.to_numpy()].sum())
+    if dtype != object and pd.api.types.is_string_dtype(dtype):
+        return int((series.str.len() > LONG_STRING_CHARS).sum())
+    lengths = series.dropna().astype(str).str.len()
+    return int((lengths > LONG_STRING_CHARS).sum())
+
+
+def _serialize_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, (np.bool_)):
+        return bool(value)
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if pd.isna(value):
+        return None
+    return value
+
+
+class DatasetStats(Protocol):
+    rows: int
+    columns: list[str]
+    dtypes: dict[str, str]
+    null_pct: dict[str, float]
+    duplicate_rows: int
+    duplicate_detection: dict
+    numeric_columns: list[str]
+    string_columns: list[str]
+    basic_stats: dict[str, dict[str, Any]]
+    pk_column: str | None
+    pk_null_count: int
+    pk_duplicate_count: int
+    pk_duplicate_detection: dict
+    outlier_mode: str
+    outlier_counts: dict[str, int]
+    long_string_counts: dict[str, int]
+
+
+class AnalysisContext:
+    """Parses a dataset once and memoizes the statistics shared by profiling and validation.
+
+    ``known_columns`` carries per-column results over from an earlier analysis of the
+    same values (keys ``null_count``, ``basic_stats``, ``outliers``, ``long_strings``),
+    and ``known_duplicate_rows`` the duplicate count; only the statistics missing there
+    are computed from the frame.
+    """
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        frame: pd.DataFrame | None = None,
+        outlier_mode: str = "sigma",
+        known_columns: dict[str, dict[str, Any]] | None = None,
+        known_duplicate_rows: int | None = None,
+    ):
+        if file_path is None and frame is None:
+            raise ValueError("AnalysisContext needs a file path or a DataFrame")
+        self.file_path = file_path
+        self._frame = frame
+        self.outlier_mode = outlier_mode
+        self.known_columns = known_columns or {}
+        self.known_duplicate_rows = known_duplicate_rows
+
+    def _unknown(self, columns: list[str], key: str) -> list[str]:
+        return [col for col in columns if key not in self.known_columns.get(col, {})]
+
+    def _known(self, columns: list[str], key: str) -> dict[str, Any]:
+        return {
+            col: self.known_columns[col][key]
+            for col in columns
+            if key in self.known_columns.get(col, {})
+        }
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        if self._frame is not None:
+            return self._frame
+        return read_frame(self.file_path)
+
+    @cached_property
+    def rows(self) -> int:
+        return int(len(self.df))
+
+    @cached_property
+    def columns(self) -> list[str]:
+        return self.df.columns.tolist()
+
+    @cached_property
+    def dtypes(self) -> dict[str, str]:
+        return {col: str(dtype) for col, dtype in self.df.dtypes.items()}
+
+    @cached_property
+    def null_counts(self) -> dict[str, int]:
+        counts = self._known(self.columns, "null_count")
+        unknown = self._unknown(self.columns, "null_count")
+        if unknown:
+            counts.update({col: int(count) for col, count in self.df[unknown].isna().sum().items()})
+        return {col: counts[col] for col in self.columns}
+
+    @cached_property
+    def null_pct(self) -> dict[str, float]:
+        if self.rows == 0:
+            return {col: float("nan") for col in self.columns}
+        return {col: count / self.rows for col, count in self.null_counts.items()}
+
+    @cached_property
+    def duplicate_mask(self) -> pd.Series:
+        return self.df.duplicated()
+
+    @cached_property
+    def duplicate_rows(self) -> int:
+        if self.known_duplicate_rows is not None:
+            return self.known_duplicate_rows
+        return int(self.duplicate_mask.sum())
+
+    @cached_property
+    def duplicate_detection(self) -> dict:
+        return {"method": "exact"}
+
+    @cached_property
+    def numeric_columns(self) -> list[str]:
+        return self.df.select_dtypes(include=["number"]).columns.tolist()
+
+    @cached_property
+    def string_columns(self) -> list[str]:
+        return [col for col, dtype in self.df.dtypes.items() if is_text_dtype(dtype)]
+
+    @cached_property
+    def means(self) -> pd.Series:
+        return self.df[self.numeric_columns].mean()
+
+    @cached_property
+    def stds(self) -> pd.Series:
+        return self.df[self.numeric_columns].std()
+
+    @cached_property
+    def basic_stats(self) -> dict[str, dict[str, Any]]:
+        known = self._known(self.numeric_columns, "basic_stats")
+        stats: dict[str, dict[str, Any]] = {}
+        for col in self.numeric_columns:
+            if col in known:
+                stats[col] = known[col]
+                continue
+            described = self.df[col].describe().to_dict()
+            stats[col] = {k: _serialize_value(v) for k, v in described.items()}
+        return stats
+
+    @cached_property
+    def pk_column(self) -> str | None:
+        return next((c for c in self.columns if c.lower() in PK_CANDIDATES), None)
+
+    @cached_property
+    def pk_null_count(self) -> int:
+        if self.pk_column is None:
+            return 0
+        return self.null_counts[self.pk_column]
+
+    @cached_property
+    def pk_duplicate_count(self) -> int:
+        if self.pk_column is None:
+            return 0
+        return int(self.df[self.pk_column].duplicated().sum())
+
+    @cached_property
+    def pk_duplicate_detection(self) -> dict:
+        return {"method": "exact"}
+
+    @cached_property
+    def outlier_counts(self) -> dict[str, int]:
+        counts = self._known(self.numeric_columns, "outliers")
+        columns = self._unknown(self.numeric_columns, "outliers")
+        if columns:
+            values = numeric_matrix(self.df, columns)
+            low, high = outlier_bounds(values, self.outlier_mode)
+            computed = count_outliers(values, low, high)
+            counts.update({col: int(computed[i]) for i, col in enumerate(columns) if not np.isnan(low[i])})
+        return {col: counts[col] for col in self.numeric_columns if col in counts}
+
+    @cached_property
+    def long_string_counts(self) -> dict[str, int]:
+        counts = self._known(self.string_columns, "long_strings")
+        for col in self._unknown(self.string_columns, "long_strings"):
+            counts[col] = count_long_strings(self.df[col])
+        return {col: counts[col] for col in self.string_columns}
+
+
+def get_context(source: str | DatasetStats) -> DatasetStats:
+    if isinstance(source, str):
+        return AnalysisContext(source)
+    return source
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import redis
+
+from app.services.ratelimit import RedisBacked
+
+
+def fingerprint(payload: Any) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TieredCache(RedisBacked):
+    """JSON values in an in-process LRU in front of Redis.
+
+    Redis failures degrade to the local tier; after an error Redis is skipped for
+    ``redis_retry_seconds`` so a dead cache host does not add latency to every lookup.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        redis_url: str | None,
+        max_entries: int = 1024,
+        ttl_seconds: int = 86400,
+        redis_retry_seconds: float = 30.0,
+    ):
+        super().__init__(redis_url, redis_retry_seconds)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.local = LRUCache(max_entries, ttl_seconds)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Any | None:
+        raw = self.local.get(key)
+        if raw is None and self._redis_available():
+            try:
+                raw = self._redis.get(self._redis_key(key))
+            except redis.RedisError:
+                self._mark_redis_down()
+            if raw is not None:
+                self.local.set(key, raw)
+        # Values are stored serialized so callers never share a mutable cached object.
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        raw = json.dumps(value)
+        self.local.set(key, raw)
+        if not self._redis_available():
+            return
+        try:
+            self._redis.set(self._redis_key(key), raw, ex=self.ttl_seconds)
+        except redis.RedisError:
+            self._mark_redis_down()
@@ -2,13 +2,26 @@ from __future__ import annotations
 
 import os
 import re
+import tempfile
 import uuid
+from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
+from app.core.config import get_settings
+from app.services.ingestion import dataset_size_bytes, iter_frames, read_columns, read_frame
+from app.services.metrics import StageRecorder
+from app.services.outliers import inlier_rows, numeric_matrix, outlier_bounds
+from app.services.schema import is_plain_numeric
+from app.services.sketches import RowHashSet, hash_rows
+from app.services.streaming import NumericAccumulator, merge_dtype
 from app.utils.files import ensure_dir
 
+settings = get_settings()
+
 
 _TYPE_MAP = {
     "int": "int64",
@@ -44,59 +57,381 @@ def _parse_convert_details(details: str, columns: list[str]) -> tuple[str | None
     return column, dtype
 
 
-def _apply_outlier_filter(df: pd.DataFrame) -> pd.DataFrame:
-    numeric_cols = df.select_dtypes(include=["number"]).columns
-    if numeric_cols.empty:
-        return df
+@dataclass(frozen=True)
+class FillNulls:
+    pass
 
-    mask = pd.Series([True] * len(df))
-    for col in numeric_cols:
-        series = df[col].dropna()
-        if series.empty:
-            continue
-        mean = series.mean()
-        std = series.std()
-        if std and std > 0:
-            mask &= (df[col] >= mean - 3 * std) & (df[col] <= mean + 3 * std)
-    return df[mask]
 
+@dataclass(frozen=True)
+class DropDuplicates:
+    pass
 
-def apply_cleaning_plan(file_path: str, plan: dict[str, Any] | None, cleaned_dir: str) -> str:
-    ensure_dir(cleaned_dir)
-    df = pd.read_csv(file_path)
 
+@dataclass(frozen=True)
+class FilterOutliers:
+    mode: str = "sigma"
+
+
+@dataclass(frozen=True)
+class ConvertType:
+    column: str
+    dtype: str
+
+
+CleaningOp = FillNulls | DropDuplicates | FilterOutliers | ConvertType
+
+# Applying these twice in a row is the same as applying them once.
+_IDEMPOTENT_OPS = (FillNulls, DropDuplicates)
+
+
+def _normalize_step(step: Any, columns: list[str], outlier_mode: str) -> CleaningOp | None:
+    if not isinstance(step, dict):
+        return None
+    action = str(step.get("action", "")).lower()
+    details = str(step.get("details", "")).lower()
+
+    if "fill" in action and "null" in action:
+        return FillNulls()
+    if "drop" in action and "duplicate" in action:
+        return DropDuplicates()
+    if "convert" in action or "cast" in action:
+        column, dtype = _parse_convert_details(details, columns)
+        return ConvertType(column, dtype) if column and dtype else None
+    if "outlier" in action:
+        return FilterOutliers(outlier_mode)
+    return None
+
+
+def compile_cleaning_plan(
+    plan: dict[str, Any] | None,
+    columns: list[str],
+    outlier_mode: str = "sigma",
+) -> list[CleaningOp]:
+    """Turn an LLM/fallback plan into typed operations, dropping unknown steps and no-op repeats."""
     steps = []
     if isinstance(plan, dict):
         steps = plan.get("steps", []) if isinstance(plan.get("steps"), list) else []
 
+    ops: list[CleaningOp] = []
     for step in steps:
-        action = str(step.get("action", "")).lower()
-        details = str(step.get("details", "")).lower()
-
-        if "fill" in action and "null" in action:
-            numeric_cols = df.select_dtypes(include=["number"]).columns
-            if not numeric_cols.empty:
-                df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
+        op = _normalize_step(step, columns, outlier_mode)
+        if op is None:
             continue
-
-        if "drop" in action and "duplicate" in action:
-            df = df.drop_duplicates()
+        if ops and isinstance(op, _IDEMPOTENT_OPS) and ops[-1] == op:
             continue
+        ops.append(op)
+    return ops
 
-        if "convert" in action or "cast" in action:
-            column, dtype = _parse_convert_details(details, df.columns.tolist())
-            if column and dtype:
-                if "datetime" in dtype:
-                    df[column] = pd.to_datetime(df[column], errors="coerce")
-                else:
-                    df[column] = df[column].astype(dtype, errors="ignore")
-            continue
 
-        if "outlier" in action:
-            df = _apply_outlier_filter(df)
+@dataclass
+class CleaningDelta:
+    """What a cleaning run changed, so the follow-up report only recomputes affected statistics."""
+
+    rows_before: int = 0
+    rows_removed: int = 0
+    changed_columns: set[str] = field(default_factory=set)
+    # True when the last row-level change was a de-duplication, i.e. no duplicate rows remain.
+    duplicates_resolved: bool = False
+
+
+@dataclass
+class CleaningOutcome:
+    path: str
+    delta: CleaningDelta
+    # The cleaned rows when cleaning ran in memory; None for the chunked path.
+    frame: pd.DataFrame | None = None
+
+
+def _fill_numeric(df: pd.DataFrame, fills: dict[str, float]) -> None:
+    if not fills:
+        return
+    for col, value in fills.items():
+        # Nullable integer columns cannot hold a fractional median.
+        if pd.api.types.is_extension_array_dtype(df[col].dtype) and value != np.round(value):
+            df[col] = df[col].astype("float64")
+    df.fillna(fills, inplace=True)
+
+
+def _fill_nulls(df: pd.DataFrame, keep: np.ndarray) -> list[str]:
+    numeric_cols = df.select_dtypes(include=["number"]).columns
+    medians = {}
+    for col in numeric_cols:
+        values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        if not np.isnan(values[keep]).any():
             continue
+        kept = values[keep]
+        kept = kept[~np.isnan(kept)]
+        if len(kept):
+            medians[col] = np.median(kept)
+    _fill_numeric(df, medians)
+    return list(medians)
+
+
+def _drop_duplicates(df: pd.DataFrame, keep: np.ndarray) -> None:
+    # Exact row comparison: cleaning must never drop a row on a digest match alone.
+    kept_rows = np.flatnonzero(keep)
+    duplicated = df.iloc[kept_rows].duplicated().to_numpy()
+    keep[kept_rows[duplicated]] = False
+
+
+def _filter_outliers(df: pd.DataFrame, keep: np.ndarray, op: FilterOutliers) -> None:
+    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    if not numeric_cols:
+        return
+    values = numeric_matrix(df, numeric_cols)
+    low, high = outlier_bounds(values[keep], op.mode)
+    keep &= inlier_rows(values, low, high)
+
+
+def _convert_type(df: pd.DataFrame, op: ConvertType) -> None:
+    if "datetime" in op.dtype:
+        df[op.column] = pd.to_datetime(df[op.column], errors="coerce")
+    else:
+        df[op.column] = df[op.column].astype(op.dtype, errors="ignore")
+
 
+def execute_cleaning_ops(
+    df: pd.DataFrame,
+    ops: list[CleaningOp],
+    delta: CleaningDelta | None = None,
+) -> pd.DataFrame:
+    """Run compiled operations with a single row materialization at the end.
+
+    Row filters (duplicates, outliers) only narrow one shared boolean mask, so
+    consecutive filters are fused; later statistics (medians, mean/std) are computed
+    over the rows the mask still keeps, which matches applying the steps in order.
+    Fills and conversions write into the frame in place. Changes are recorded in
+    ``delta`` when one is given.
+    """
+    delta = delta if delta is not None else CleaningDelta()
+    delta.rows_before = len(df)
+    keep = np.ones(len(df), dtype=bool)
+    for op in ops:
+        if isinstance(op, FillNulls):
+            filled = _fill_nulls(df, keep)
+            if filled:
+                delta.changed_columns.update(filled)
+                delta.duplicates_resolved = False
+        elif isinstance(op, DropDuplicates):
+            _drop_duplicates(df, keep)
+            delta.duplicates_resolved = True
+        elif isinstance(op, FilterOutliers):
+            _filter_outliers(df, keep, op)
+        elif isinstance(op, ConvertType):
+            _convert_type(df, op)
+            delta.changed_columns.add(op.column)
+            delta.duplicates_resolved = False
+    delta.rows_removed = int(len(df) - keep.sum())
+    return df if keep.all() else df[keep]
+
+
+class _SpilledRows:
+    """Rows appended in order to Arrow IPC files, read back by position through memory maps.
+
+    A chunk Arrow cannot represent (e.g. an object column mixing ints and strings) is
+    pickled instead and read back whole.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._paths: list[str] = []
+        self._offsets: list[int] = [0]
+
+    def append(self, rows: pd.DataFrame) -> None:
+        if rows.empty:
+            return
+        path = os.path.join(self.directory, str(len(self._paths)))
+        try:
+            table = pa.Table.from_pandas(rows, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            path += ".pkl"
+            rows.to_pickle(path)
+        else:
+            path += ".arrow"
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self._paths.append(path)
+        self._offsets.append(self._offsets[-1] + len(rows))
+
+    def _read(self, number: int, local: np.ndarray) -> pd.DataFrame:
+        path = self._paths[number]
+        if path.endswith(".pkl"):
+            return pd.read_pickle(path).iloc[local]
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            return table.take(pa.array(local)).to_pandas()
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """The rows at ``positions``, in that order, as Python objects."""
+        parts = []
+        file_numbers = np.searchsorted(self._offsets, positions, side="right") - 1
+        for number in np.unique(file_numbers):
+            which = np.flatnonzero(file_numbers == number)
+            part = self._read(number, positions[which] - self._offsets[number]).astype(object)
+            part.index = which
+            parts.append(part)
+        return pd.concat(parts).sort_index()
+
+
+def _rows_equal(left: pd.DataFrame, right: pd.DataFrame) -> np.ndarray:
+    """Row-wise exact equality, treating missing values as equal.
+
+    Values are compared as Python objects, so ints and floats compare exactly
+    (2**53 + 1 != 2.0**53) whatever dtype each chunk was parsed with.
+    """
+    equal = np.ones(len(left), dtype=bool)
+    for col in left.columns:
+        a = left[col].astype(object).to_numpy()
+        b = right[col].to_numpy(dtype=object)
+        a_missing = pd.isna(a)
+        b_missing = pd.isna(b)
+        both = ~a_missing & ~b_missing
+        same = a_missing & b_missing
+        same[both] = a[both] == b[both]
+        equal &= same
+    return equal
+
+
+class _ChunkDeduplicator:
+    """Exact de-duplication across chunks in bounded memory.
+
+    Digests only find candidates: the first occurrence of every row is spilled to disk
+    and a digest match counts as a duplicate only if the rows are actually equal. A
+    distinct row whose digest collides is kept, as are its own later copies.
+    """
+
+    def __init__(self, spill_dir: str):
+        self._seen = RowHashSet(track_positions=True)
+        self._rows = _SpilledRows(spill_dir)
+
+    def unique_rows(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Mask of the rows in ``chunk`` not seen before, in this chunk or earlier ones."""
+        unique = ~chunk.duplicated().to_numpy()
+        candidates = np.flatnonzero(unique)
+        hashes = hash_rows(chunk.iloc[candidates])
+        positions = self._seen.positions(hashes)
+        matched = positions >= 0
+        if matched.any():
+            stored = self._rows.take(positions[matched])
+            duplicate = _rows_equal(chunk.iloc[candidates[matched]], stored)
+            unique[candidates[matched][duplicate]] = False
+
+        fresh = candidates[~matched]
+        added = self._seen.add(hashes[~matched])
+        self._rows.append(chunk.iloc[fresh[added]])
+        return unique
+
+
+def _collect_plan_statistics(
+    file_path: str,
+    ops: list[CleaningOp],
+    chunksize: int,
+) -> dict[str, NumericAccumulator]:
+    """First pass of chunked cleaning: global per-column statistics the plan needs."""
+    if not any(isinstance(op, (FillNulls, FilterOutliers)) for op in ops):
+        return {}
+
+    rng = np.random.default_rng(0)
+    dtypes: dict[str, np.dtype] = {}
+    numeric: dict[str, NumericAccumulator] = {}
+    for chunk in iter_frames(file_path, chunksize):
+        for op in ops:
+            if isinstance(op, ConvertType):
+                _convert_type(chunk, op)
+        for col in chunk.columns:
+            dtypes[col] = merge_dtype(dtypes.get(col), chunk[col].dtype)
+            if is_plain_numeric(chunk[col].dtype):
+                acc = numeric.setdefault(col, NumericAccumulator(rng))
+                acc.update(chunk[col].to_numpy(dtype="float64", na_value=np.nan))
+    return {col: acc for col, acc in numeric.items() if is_plain_numeric(dtypes[col])}
+
+
+def _stacked_bounds(
+    stats: dict[str, NumericAccumulator],
+    mode: str,
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    columns = list(stats)
+    limits = [stats[col].outlier_bounds(mode) for col in columns]
+    low = np.array([limit[0] for limit in limits])
+    high = np.array([limit[1] for limit in limits])
+    return columns, low, high
+
+
+def _clean_in_chunks(file_path: str, ops: list[CleaningOp], cleaned_path: str, chunksize: int) -> None:
+    """Two-pass cleaning whose memory use is bounded by the chunk size.
+
+    Unlike the in-memory path, medians and outlier bounds come from the input file
+    (after type conversions) rather than from the rows left by earlier steps, and
+    medians are approximate for columns with more than QUANTILE_SAMPLE_SIZE values.
+    """
+    stats = _collect_plan_statistics(file_path, ops, chunksize)
+    medians = {col: acc.quantile(0.5) for col, acc in stats.items() if acc.count}
+    bounds = {
+        op.mode: _stacked_bounds(stats, op.mode) for op in ops if isinstance(op, FilterOutliers)
+    }
+    wrote_header = False
+    with (
+        open(cleaned_path, "w", newline="") as out_file,
+        tempfile.TemporaryDirectory(dir=os.path.dirname(cleaned_path)) as spill_dir,
+    ):
+        # Each de-duplication step keeps its own record of the rows it has let through.
+        deduplicators = {
+            index: _ChunkDeduplicator(tempfile.mkdtemp(dir=spill_dir))
+            for index, op in enumerate(ops)
+            if isinstance(op, DropDuplicates)
+        }
+        for chunk in iter_frames(file_path, chunksize):
+            keep = np.ones(len(chunk), dtype=bool)
+            for index, op in enumerate(ops):
+                if isinstance(op, FillNulls):
+                    _fill_numeric(chunk, {col: value for col, value in medians.items() if col in chunk.columns})
+                elif isinstance(op, DropDuplicates):
+                    kept_rows = np.flatnonzero(keep)
+                    keep[kept_rows] = deduplicators[index].unique_rows(chunk.iloc[kept_rows])
+                elif isinstance(op, FilterOutliers):
+                    columns, low, high = bounds[op.mode]
+                    if columns:
+                        keep &= inlier_rows(numeric_matrix(chunk, columns), low, high)
+                elif isinstance(op, ConvertType):
+                    _convert_type(chunk, op)
+            chunk[keep].to_csv(out_file, header=not wrote_header, index=False)
+            wrote_header = True
+
+        if not wrote_header:
+            pd.DataFrame(columns=read_columns(file_path)).to_csv(out_file, index=False)
+
+
+def clean_file(
+    file_path: str,
+    plan: dict[str, Any] | None,
+    cleaned_dir: str,
+    recorder: StageRecorder | None = None,
+) -> CleaningOutcome:
+    recorder = recorder or StageRecorder()
+    ensure_dir(cleaned_dir)
     cleaned_name = f"{uuid.uuid4().hex}.csv"
     cleaned_path = os.path.join(cleaned_dir, cleaned_name)
-    df.to_csv(cleaned_path, index=False)
-    return cleaned_path
+
+    source_bytes = dataset_size_bytes(file_path)
+    if source_bytes > settings.stream_threshold_bytes:
+        # Both chunked passes interleave reading, cleaning and writing; record them as one stage.
+        with recorder.stage("clean", bytes=source_bytes):
+            ops = compile_cleaning_plan(plan, read_columns(file_path), settings.outlier_mode)
+            _clean_in_chunks(file_path, ops, cleaned_path, settings.stream_chunk_rows)
+        return CleaningOutcome(cleaned_path, CleaningDelta())
+
+    with recorder.stage("parse", bytes=source_bytes) as stage:
+        df = read_frame(file_path)
+        stage["rows"] = len(df)
+    with recorder.stage("clean", rows=len(df)):
+        ops = compile_cleaning_plan(plan, df.columns.tolist(), settings.outlier_mode)
+        delta = CleaningDelta()
+        df = execute_cleaning_ops(df, ops, delta)
+    with recorder.stage("write", rows=len(df)) as stage:
+        df.to_csv(cleaned_path, index=False)
+        stage["bytes"] = os.path.getsize(cleaned_path)
+    return CleaningOutcome(cleaned_path, delta, df)
+
+
+def apply_cleaning_plan(file_path: str, plan: dict[str, Any] | None, cleaned_dir: str) -> str:
+    return clean_file(file_path, plan, cleaned_dir).path
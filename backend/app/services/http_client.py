@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+
+import httpx
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+_async_loop: asyncio.AbstractEventLoop | None = None
+# Strong references to in-flight closes of clients left behind by a previous event loop.
+_closing: set[asyncio.Task] = set()
+
+
+def _client_options() -> dict:
+    return {
+        "http2": settings.llm_http2,
+        "timeout": httpx.Timeout(
+            settings.llm_timeout_seconds,
+            connect=settings.llm_connect_timeout_seconds,
+        ),
+        "limits": httpx.Limits(
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+            keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+        ),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide keep-alive client shared by all outbound LLM calls."""
+    global _client
+    if _client is None or _client.is_closed:
+        with _lock:
+            if _client is None or _client.is_closed:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    # Closing the sockets works even if their loop has shut down; only the
+    # transport callbacks scheduled on that loop fail afterwards.
+    with contextlib.suppress(RuntimeError):
+        await client.aclose()
+
+
+def _discard_async_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    if client.is_closed:
+        return
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    task = asyncio.get_running_loop().create_task(_aclose_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of get_http_client, bound to the running event loop.
+
+    A client left over from a different loop is closed, not just dropped, so its
+    pooled connections are released.
+    """
+    global _async_client, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_loop is not loop:
+        if _async_client is not None:
+            _discard_async_client(_async_client, _async_loop)
+        _async_client = httpx.AsyncClient(**_client_options())
+        _async_loop = loop
+    return _async_client
+
+
+def close_http_client() -> None:
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+async def close_async_http_client() -> None:
+    global _async_client, _async_loop
+    client, _async_client, _async_loop = _async_client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+def reset_http_clients() -> None:
+    # Connections inherited across fork() must not be shared with the parent.
+    global _client, _async_client, _async_loop
+    _client = None
+    _async_client = None
+    _async_loop = None
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import io
+import os
+import uuid
+from typing import Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from app.services.rowindex import load_row_index, read_byte_rows
+from app.services.schema import (
+    ARROW_STRING_DTYPE,
+    CATEGORY,
+    DatasetSchema,
+    apply_schema,
+    infer_schema,
+    load_schema,
+    save_schema,
+)
+
+CSV_EXTENSIONS = {".csv"}
+COLUMNAR_EXTENSIONS = {".parquet", ".feather"}
+ALLOWED_EXTENSIONS = CSV_EXTENSIONS | COLUMNAR_EXTENSIONS
+
+
+def file_extension(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lower()
+
+
+def is_columnar(file_path: str) -> bool:
+    return file_extension(file_path) in COLUMNAR_EXTENSIONS
+
+
+def _arrow_types(schema: DatasetSchema | None):
+    if schema is None:
+        return None
+    return {pa.string(): ARROW_STRING_DTYPE, pa.large_string(): ARROW_STRING_DTYPE}.get
+
+
+def _parquet_file(file_path: str, schema: DatasetSchema | None) -> pq.ParquetFile:
+    # Categorical columns are read straight from Parquet's dictionary pages.
+    if schema is None:
+        return pq.ParquetFile(file_path)
+    names = set(pq.read_schema(file_path).names)
+    return pq.ParquetFile(file_path, read_dictionary=[c for c in schema.columns_of(CATEGORY) if c in names])
+
+
+def read_frame(
+    file_path: str,
+    columns: list[str] | None = None,
+    nrows: int | None = None,
+    typed: bool = True,
+) -> pd.DataFrame:
+    """Read a dataset, applying its inferred column schema unless ``typed`` is False."""
+    schema = load_schema(file_path) if typed else None
+    types_mapper = _arrow_types(schema)
+    ext = file_extension(file_path)
+    if ext == ".parquet":
+        if nrows is None:
+            parquet = _parquet_file(file_path, schema)
+            df = parquet.read(columns=columns).to_pandas(types_mapper=types_mapper)
+        else:
+            batches = _parquet_file(file_path, schema).iter_batches(batch_size=nrows, columns=columns)
+            batch = next(batches, None)
+            if batch is None:
+                return pq.read_schema(file_path).empty_table().to_pandas()
+            df = batch.to_pandas(types_mapper=types_mapper)
+    elif ext == ".feather":
+        df = feather.read_table(file_path, columns=columns, memory_map=True).to_pandas(types_mapper=types_mapper)
+        df = df if nrows is None else df.head(nrows)
+    else:
+        dtype = schema.csv_dtypes() if schema else None
+        df = pd.read_csv(file_path, usecols=columns, nrows=nrows, dtype=dtype)
+    return apply_schema(df, schema)
+
+
+def iter_frames(file_path: str, chunksize: int, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+    schema = load_schema(file_path)
+    types_mapper = _arrow_types(schema)
+    ext = file_extension(file_path)
+    if ext == ".parquet":
+        for batch in _parquet_file(file_path, schema).iter_batches(batch_size=chunksize, columns=columns):
+            yield apply_schema(batch.to_pandas(types_mapper=types_mapper), schema)
+        return
+    if ext == ".feather":
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield apply_schema(batch.to_pandas(types_mapper=types_mapper), schema)
+        return
+    dtype = schema.csv_dtypes() if schema else None
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=columns, dtype=dtype):
+        yield apply_schema(chunk, schema)
+
+
+def read_row_range(file_path: str, start: int, stop: int, columns: list[str] | None = None) -> pd.DataFrame:
+    """Rows ``start``..``stop - 1`` without parsing the rows before them.
+
+    CSV files seek through their row index (falling back to skipping rows when there
+    is none), Parquet files read only the row groups that overlap the range and
+    Feather files slice the memory-mapped table.
+    """
+    schema = load_schema(file_path)
+    types_mapper = _arrow_types(schema)
+    start, stop = max(0, start), max(start, stop)
+    ext = file_extension(file_path)
+    if ext == ".parquet":
+        parquet = _parquet_file(file_path, schema)
+        metadata = parquet.metadata
+        groups, first_row, row = [], None, 0
+        for i in range(metadata.num_row_groups):
+            group_rows = metadata.row_group(i).num_rows
+            if row < stop and row + group_rows > start:
+                groups.append(i)
+                first_row = row if first_row is None else first_row
+            row += group_rows
+        if not groups:
+            return parquet.schema_arrow.empty_table().select(columns or parquet.schema_arrow.names).to_pandas()
+        table = parquet.read_row_groups(groups, columns=columns)
+        df = table.slice(start - first_row, stop - start).to_pandas(types_mapper=types_mapper)
+    elif ext == ".feather":
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        df = table.slice(start, stop - start).to_pandas(types_mapper=types_mapper)
+    else:
+        dtype = schema.csv_dtypes() if schema else None
+        index = load_row_index(file_path)
+        if index is None:
+            df = pd.read_csv(file_path, usecols=columns, dtype=dtype, skiprows=range(1, start + 1), nrows=stop - start)
+        else:
+            data = read_byte_rows(file_path, index, start, stop)
+            df = pd.read_csv(io.BytesIO(data), usecols=columns, dtype=dtype) if data else pd.DataFrame()
+    return apply_schema(df, schema)
+
+
+def ensure_schema(file_path: str, sample_rows: int) -> DatasetSchema:
+    """Load the dataset's column schema, inferring it from the first ``sample_rows`` rows once."""
+    schema = load_schema(file_path)
+    if schema is None:
+        schema = infer_schema(read_frame(file_path, nrows=sample_rows, typed=False))
+        save_schema(file_path, schema)
+    return schema
+
+
+def read_columns(file_path: str) -> list[str]:
+    ext = file_extension(file_path)
+    if ext == ".parquet":
+        return pq.read_schema(file_path).names
+    if ext == ".feather":
+        return feather.read_table(file_path, memory_map=True).schema.names
+    return pd.read_csv(file_path, nrows=0).columns.tolist()
+
+
+def dataset_size_bytes(file_path: str) -> int:
+    # Parquet is compressed on disk; the uncompressed row-group size is a better
+    # proxy for how much memory an in-memory analysis will need.
+    if file_extension(file_path) == ".parquet":
+        metadata = pq.ParquetFile(file_path).metadata
+        return sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    return os.path.getsize(file_path)
+
+
+def columnar_path_for(file_path: str) -> str:
+    return f"{os.path.splitext(file_path)[0]}.parquet"
+
+
+def _write_csv_as_parquet(file_path: str, target: str, chunk_rows: int) -> None:
+    # The copy keeps the parsed types: categories are stored as strings (Parquet
+    # dictionary-encodes them on disk) and the schema is applied when reading, so a
+    # chunk that does not fit the inferred types cannot break the fixed Parquet schema.
+    writer: pq.ParquetWriter | None = None
+    try:
+        for chunk in pd.read_csv(file_path, chunksize=chunk_rows):
+            table = pa.Table.from_pandas(
+                chunk,
+                schema=writer.schema if writer else None,
+                preserve_index=False,
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(target, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def convert_to_columnar(file_path: str, chunk_rows: int = 100_000) -> str | None:
+    """Store a Parquet copy of an upload next to it and return its path.
+
+    Parquet uploads are used as-is. Returns None when the data cannot be represented
+    with a single Arrow schema (e.g. a column whose type drifts between CSV chunks);
+    readers then keep using the original file.
+    """
+    ext = file_extension(file_path)
+    if ext == ".parquet":
+        return file_path
+
+    target = columnar_path_for(file_path)
+    if os.path.exists(target):
+        return target
+
+    # Identical uploads share the target, so each writer needs its own temp file.
+    tmp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+    try:
+        if ext == ".feather":
+            pq.write_table(feather.read_table(file_path, memory_map=True), tmp_path)
+        else:
+            _write_csv_as_parquet(file_path, tmp_path, chunk_rows)
+        os.replace(tmp_path, target)
+    except (pa.ArrowException, ValueError, TypeError):
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return target
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any
 
@@ -7,33 +8,91 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
 from app.core.config import get_settings
+from app.services.cache import TieredCache, fingerprint
+from app.services.http_client import get_async_http_client, get_http_client
+from app.services.ratelimit import CircuitBreaker, RateLimiter
 
 settings = get_settings()
 
+# Bump when a prompt changes so cached responses for the old prompt are not reused.
+PROMPT_VERSION = 1
+
+_cache = TieredCache(
+    "llm",
+    settings.redis_url,
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+)
+
+
+_rate_limiter = RateLimiter(
+    "gemini",
+    settings.redis_url,
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+)
+_breaker = CircuitBreaker(
+    "gemini",
+    settings.redis_url,
+    failure_threshold=settings.llm_breaker_failure_threshold,
+    reset_seconds=settings.llm_breaker_reset_seconds,
+    # A probe makes up to two attempts (see _retry_policy) with a short wait between them.
+    probe_timeout_seconds=2 * settings.llm_timeout_seconds + 6,
+)
+
+
+def _cache_key(kind: str, issues: list[dict]) -> str:
+    return fingerprint({
+        "kind": kind,
+        "prompt_version": PROMPT_VERSION,
+        "models": [settings.gemini_model, settings.gemini_fallback_model],
+        "issues": issues,
+    })
+
+
+def _cache_get(key: str) -> Any | None:
+    return _cache.get(key) if settings.llm_cache_enabled else None
+
+
+def _cache_set(key: str, value: Any) -> None:
+    if settings.llm_cache_enabled:
+        _cache.set(key, value)
+
 
 def _gemini_endpoint(model: str) -> str:
     return f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
 
 
+_UNHEALTHY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
 def _should_retry(exc: Exception) -> bool:
+    # 429s are not retried: the circuit breaker backs off for every worker at once.
     if isinstance(exc, httpx.HTTPStatusError):
-        return exc.response.status_code in {429, 500, 502, 503, 504}
+        return exc.response.status_code in {500, 502, 503, 504}
     return isinstance(exc, httpx.RequestError)
 
 
-@retry(
-    stop=stop_after_attempt(2),
-    wait=wait_exponential(multiplier=1, min=1, max=6),
-    retry=retry_if_exception(_should_retry),
-    reraise=True,
-)
-def _call_gemini_raw(prompt: str, model: str) -> dict:
-    url = _gemini_endpoint(model)
-    headers = {
-        "x-goog-api-key": settings.gemini_api_key,
-        "Content-Type": "application/json",
-    }
-    payload = {
+def _admit(prompt: str) -> bool:
+    # Rough token estimate (~4 characters per token) is enough for budgeting.
+    return _breaker.allow() and _rate_limiter.try_acquire(tokens=len(prompt) // 4)
+
+
+def _record_failure(exc: httpx.HTTPError) -> None:
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code not in _UNHEALTHY_STATUS_CODES:
+            return
+        retry_after = exc.response.headers.get("retry-after")
+        try:
+            _breaker.record_failure(float(retry_after) if retry_after else None)
+        except ValueError:
+            _breaker.record_failure()
+        return
+    _breaker.record_failure()
+
+
+def _request_args(prompt: str, model: str, generation_config: dict | None) -> dict[str, Any]:
+    payload: dict[str, Any] = {
         "contents": [
             {
                 "role": "user",
@@ -41,10 +100,38 @@ def _call_gemini_raw(prompt: str, model: str) -> dict:
             }
         ]
     }
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.post(url, headers=headers, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+    if generation_config:
+        payload["generationConfig"] = generation_config
+    return {
+        "url": _gemini_endpoint(model),
+        "headers": {
+            "x-goog-api-key": settings.gemini_api_key,
+            "Content-Type": "application/json",
+        },
+        "json": payload,
+    }
+
+
+_retry_policy = retry(
+    stop=stop_after_attempt(2),
+    wait=wait_exponential(multiplier=1, min=1, max=6),
+    retry=retry_if_exception(_should_retry),
+    reraise=True,
+)
+
+
+@_retry_policy
+def _call_gemini_raw(prompt: str, model: str, generation_config: dict | None = None) -> dict:
+    resp = get_http_client().post(**_request_args(prompt, model, generation_config))
+    resp.raise_for_status()
+    return resp.json()
+
+
+@_retry_policy
+async def _call_gemini_raw_async(prompt: str, model: str, generation_config: dict | None = None) -> dict:
+    resp = await get_async_http_client().post(**_request_args(prompt, model, generation_config))
+    resp.raise_for_status()
+    return resp.json()
 
 
 def _extract_text(data: dict) -> str | None:
@@ -54,25 +141,81 @@ def _extract_text(data: dict) -> str | None:
         return None
 
 
-def _call_gemini(prompt: str) -> str | None:
-    if not settings.gemini_api_key:
-        return None
-
+def _models() -> list[str]:
     models = [settings.gemini_model]
     if settings.gemini_fallback_model and settings.gemini_fallback_model not in models:
         models.append(settings.gemini_fallback_model)
+    return models
+
 
-    for model in models:
+def _call_gemini(prompt: str, generation_config: dict | None = None) -> str | None:
+    if not settings.gemini_api_key:
+        return None
+
+    for model in _models():
+        if not _admit(prompt):
+            return None
         try:
-            data = _call_gemini_raw(prompt, model)
-            text = _extract_text(data)
-            if text:
-                return text
-        except (httpx.HTTPError, httpx.RequestError):
+            data = _call_gemini_raw(prompt, model, generation_config)
+        except (httpx.HTTPError, httpx.RequestError) as exc:
+            _record_failure(exc)
             continue
+        _breaker.record_success()
+        text = _extract_text(data)
+        if text:
+            return text
     return None
 
 
+async def _call_model_async(prompt: str, model: str, generation_config: dict | None) -> str | None:
+    # The limiter and breaker talk to Redis synchronously; keep that off the event loop.
+    if not await asyncio.to_thread(_admit, prompt):
+        return None
+    try:
+        data = await _call_gemini_raw_async(prompt, model, generation_config)
+    except (httpx.HTTPError, httpx.RequestError) as exc:
+        await asyncio.to_thread(_record_failure, exc)
+        return None
+    await asyncio.to_thread(_breaker.record_success)
+    return _extract_text(data)
+
+
+async def _call_gemini_async(prompt: str, generation_config: dict | None = None) -> str | None:
+    """Async _call_gemini that hedges with the fallback model.
+
+    The fallback request starts as soon as the primary fails, or after
+    ``llm_hedge_delay_seconds`` if the primary has not answered yet; the first
+    non-empty answer wins and the other request is cancelled.
+    """
+    if not settings.gemini_api_key:
+        return None
+
+    models = _models()
+    primary = asyncio.create_task(_call_model_async(prompt, models[0], generation_config))
+    if len(models) == 1:
+        return await primary
+
+    try:
+        text = await asyncio.wait_for(asyncio.shield(primary), timeout=settings.llm_hedge_delay_seconds)
+    except asyncio.TimeoutError:
+        pass
+    else:
+        return text or await _call_model_async(prompt, models[1], generation_config)
+
+    hedge = asyncio.create_task(_call_model_async(prompt, models[1], generation_config))
+    pending = {primary, hedge}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (primary, hedge):
+                if task in done and task.result():
+                    return task.result()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 def _fallback_summary(issues: list[dict]) -> str:
     if not issues:
         return "No issues detected. Dataset looks healthy."
@@ -104,26 +247,171 @@ def _fallback_cleaning_plan(issues: list[dict]) -> dict[str, Any]:
     return {"steps": steps, "source": "fallback"}
 
 
-def summarize_issues(issues: list[dict]) -> str:
-    prompt = (
+def _summary_prompt(issues: list[dict]) -> str:
+    return (
         "You are a data quality assistant. Summarize the following issues in plain English "
         "and suggest practical fixes. Keep it short.\n\n"
         f"Issues: {json.dumps(issues)}"
     )
-    response = _call_gemini(prompt)
-    return response or _fallback_summary(issues)
 
 
-def generate_cleaning_plan(issues: list[dict]) -> dict[str, Any]:
-    prompt = (
+def _cleaning_plan_prompt(issues: list[dict]) -> str:
+    return (
         "You are a data cleaning assistant. Given the issues below, output a JSON object with "
         "safe cleaning steps. Format: {\"steps\": [{\"action\": string, \"details\": string}]}\n\n"
         f"Issues: {json.dumps(issues)}"
     )
-    response = _call_gemini(prompt)
+
+
+def _combined_prompt(issues: list[dict]) -> str:
+    return (
+        "You are a data quality assistant. For the issues below, return a JSON object with "
+        "a short plain-English \"summary\" that suggests practical fixes, and safe cleaning "
+        "\"steps\" as a list of {\"action\": string, \"details\": string}.\n\n"
+        f"Issues: {json.dumps(issues)}"
+    )
+
+
+_COMBINED_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "steps": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "action": {"type": "STRING"},
+                    "details": {"type": "STRING"},
+                },
+                "required": ["action", "details"],
+            },
+        },
+    },
+    "required": ["summary", "steps"],
+}
+
+_COMBINED_GENERATION_CONFIG = {
+    "responseMimeType": "application/json",
+    "responseSchema": _COMBINED_RESPONSE_SCHEMA,
+}
+
+
+def _finish_summary(issues: list[dict], cache_key: str, response: str | None) -> str:
+    if not response:
+        return _fallback_summary(issues)
+    _cache_set(cache_key, response)
+    return response
+
+
+def _finish_cleaning_plan(issues: list[dict], cache_key: str, response: str | None) -> dict[str, Any]:
     if not response:
         return _fallback_cleaning_plan(issues)
     try:
-        return json.loads(response)
+        plan = json.loads(response)
     except json.JSONDecodeError:
+        # Not cached, so the next request for the same issues asks the model again.
         return {"raw": response, "source": "llm"}
+    _cache_set(cache_key, plan)
+    return plan
+
+
+def _parse_combined_response(response: str) -> tuple[str, dict[str, Any]] | None:
+    try:
+        data = json.loads(response)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    summary = data.get("summary")
+    steps = data.get("steps")
+    if not isinstance(summary, str) or not summary.strip() or not isinstance(steps, list):
+        return None
+    return summary, {"steps": steps}
+
+
+def summarize_issues(issues: list[dict]) -> str:
+    cache_key = _cache_key("summary", issues)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    return _finish_summary(issues, cache_key, _call_gemini(_summary_prompt(issues)))
+
+
+def generate_cleaning_plan(issues: list[dict]) -> dict[str, Any]:
+    cache_key = _cache_key("cleaning_plan", issues)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    return _finish_cleaning_plan(issues, cache_key, _call_gemini(_cleaning_plan_prompt(issues)))
+
+
+def summarize_and_plan(issues: list[dict]) -> tuple[str, dict[str, Any]]:
+    """Summary and cleaning plan from a single structured LLM request.
+
+    Falls back to the separate summarize_issues/generate_cleaning_plan calls only when
+    the combined response cannot be parsed, and to the rule-based answers when the
+    LLM is unavailable.
+    """
+    cache_key = _cache_key("combined", issues)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached["summary"], cached["cleaning_plan"]
+
+    response = _call_gemini(_combined_prompt(issues), _COMBINED_GENERATION_CONFIG)
+    if not response:
+        return _fallback_summary(issues), _fallback_cleaning_plan(issues)
+
+    parsed = _parse_combined_response(response)
+    if parsed is None:
+        return summarize_issues(issues), generate_cleaning_plan(issues)
+
+    summary, plan = parsed
+    _cache_set(cache_key, {"summary": summary, "cleaning_plan": plan})
+    return summary, plan
+
+
+async def summarize_issues_async(issues: list[dict]) -> str:
+    cache_key = _cache_key("summary", issues)
+    cached = await asyncio.to_thread(_cache_get, cache_key)
+    if cached is not None:
+        return cached
+    response = await _call_gemini_async(_summary_prompt(issues))
+    return await asyncio.to_thread(_finish_summary, issues, cache_key, response)
+
+
+async def generate_cleaning_plan_async(issues: list[dict]) -> dict[str, Any]:
+    cache_key = _cache_key("cleaning_plan", issues)
+    cached = await asyncio.to_thread(_cache_get, cache_key)
+    if cached is not None:
+        return cached
+    response = await _call_gemini_async(_cleaning_plan_prompt(issues))
+    return await asyncio.to_thread(_finish_cleaning_plan, issues, cache_key, response)
+
+
+async def summarize_and_plan_async(issues: list[dict]) -> tuple[str, dict[str, Any]]:
+    """Async summarize_and_plan; the two-call fallback runs both prompts concurrently.
+
+    Like the other async entry points, cache reads and writes (which may go to Redis)
+    run in a worker thread rather than on the event loop.
+    """
+    cache_key = _cache_key("combined", issues)
+    cached = await asyncio.to_thread(_cache_get, cache_key)
+    if cached is not None:
+        return cached["summary"], cached["cleaning_plan"]
+
+    response = await _call_gemini_async(_combined_prompt(issues), _COMBINED_GENERATION_CONFIG)
+    if not response:
+        return _fallback_summary(issues), _fallback_cleaning_plan(issues)
+
+    parsed = _parse_combined_response(response)
+    if parsed is None:
+        summary, plan = await asyncio.gather(
+            summarize_issues_async(issues),
+            generate_cleaning_plan_async(issues),
+        )
+        return summary, plan
+
+    summary, plan = parsed
+    await asyncio.to_thread(_cache_set, cache_key, {"summary": summary, "cleaning_plan": plan})
+    return summary, plan
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+_STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+STAGE_SECONDS = Histogram(
+    "dq_stage_duration_seconds",
+    "Wall time of a processing pipeline stage",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+STAGE_CPU_SECONDS = Histogram(
+    "dq_stage_cpu_seconds",
+    "CPU time of a processing pipeline stage",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+STAGE_PEAK_RSS = Gauge(
+    "dq_stage_peak_rss_bytes",
+    "Peak resident set size during the latest run of a stage (max across processes)",
+    ["stage"],
+    multiprocess_mode="max",
+)
+STAGE_ROWS = Counter("dq_stage_rows_total", "Rows handled by a processing pipeline stage", ["stage"])
+STAGE_BYTES = Counter("dq_stage_bytes_total", "Bytes handled by a processing pipeline stage", ["stage"])
+
+_CLEAR_REFS = "/proc/self/clear_refs"
+_STATUS = "/proc/self/status"
+
+
+def _reset_peak_rss() -> bool:
+    # Writing "5" resets the kernel's high-water mark (VmHWM) for this process (Linux >= 4.0).
+    try:
+        with open(_CLEAR_REFS, "w") as handle:
+            handle.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        with open(_STATUS) as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Lifetime peak; ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageRecorder:
+    """Records wall time, CPU time, peak RSS and row/byte counts per pipeline stage.
+
+    CPU time and peak RSS are process-wide, so they are exact in the analysis pool and
+    Celery workers (one job per process) and approximate for work run in API threads.
+    Every stage is also observed in the Prometheus metrics above.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str, rows: int | None = None, bytes: int | None = None) -> Iterator[dict[str, Any]]:
+        """Time a stage; callers may fill in ``rows``/``bytes`` on the yielded dict."""
+        info: dict[str, Any] = {"rows": rows, "bytes": bytes}
+        _reset_peak_rss()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield info
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            peak_rss = _peak_rss_bytes()
+            self.stages[name] = {
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+                "peak_rss_bytes": peak_rss,
+                "rows": info["rows"],
+                "bytes": info["bytes"],
+            }
+            observe_stage(name, wall, cpu, peak_rss, info["rows"], info["bytes"])
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stages": self.stages,
+            "total_wall_ms": round(sum(stage["wall_ms"] for stage in self.stages.values()), 3),
+        }
+
+
+def observe_stage(
+    name: str,
+    wall_seconds: float,
+    cpu_seconds: float | None = None,
+    peak_rss_bytes: int | None = None,
+    rows: int | None = None,
+    bytes: int | None = None,
+) -> None:
+    STAGE_SECONDS.labels(name).observe(wall_seconds)
+    if cpu_seconds is not None:
+        STAGE_CPU_SECONDS.labels(name).observe(cpu_seconds)
+    if peak_rss_bytes is not None:
+        STAGE_PEAK_RSS.labels(name).set(peak_rss_bytes)
+    if rows:
+        STAGE_ROWS.labels(name).inc(rows)
+    if bytes:
+        STAGE_BYTES.labels(name).inc(bytes)
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """Wall-time-only stage for short operations such as database writes."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - started)
+
+
+def metrics_registry() -> CollectorRegistry:
+    # With PROMETHEUS_MULTIPROC_DIR set, every process (API, analysis pool, Celery
+    # children) writes its samples there and they are aggregated at scrape time.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> bytes:
+    return generate_latest(metrics_registry())
+
+
+def start_metrics_server(port: int) -> None:
+    start_http_server(port, registry=metrics_registry())
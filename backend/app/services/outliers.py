@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+OUTLIER_MODES = ("sigma", "mad", "iqr")
+SIGMA_THRESHOLD = 3.0
+# Modified z-score cut-off (Iglewicz & Hoaglin); 1.4826 scales the MAD to a std under normality.
+MAD_THRESHOLD = 3.5
+MAD_SCALE = 1.4826
+IQR_FACTOR = 1.5
+
+RULE_LABELS = {"sigma": "3σ rule", "mad": "MAD rule", "iqr": "IQR rule"}
+
+
+def numeric_matrix(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    return df[columns].to_numpy(dtype="float64", na_value=np.nan)
+
+
+def bounds_from_spread(center: np.ndarray, spread: np.ndarray, width: float) -> tuple[np.ndarray, np.ndarray]:
+    """Limits ``center ± width * spread``; columns without a positive spread get NaN (never an outlier)."""
+    center = np.asarray(center, dtype="float64")
+    spread = np.asarray(spread, dtype="float64")
+    degenerate = ~(spread > 0)
+    low = np.where(degenerate, np.nan, center - width * spread)
+    high = np.where(degenerate, np.nan, center + width * spread)
+    return low, high
+
+
+def outlier_bounds(values: np.ndarray, mode: str = "sigma") -> tuple[np.ndarray, np.ndarray]:
+    """Per-column (low, high) limits for a 2-D float array, ignoring NaNs."""
+    if mode not in OUTLIER_MODES:
+        raise ValueError(f"Unknown outlier mode: {mode}")
+    if values.shape[0] == 0:
+        empty = np.full(values.shape[1], np.nan)
+        return empty, empty.copy()
+
+    # All-NaN columns and single values produce NaN statistics, which bounds_from_spread handles.
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if mode == "sigma":
+            return bounds_from_spread(
+                np.nanmean(values, axis=0),
+                np.nanstd(values, axis=0, ddof=1),
+                SIGMA_THRESHOLD,
+            )
+        if mode == "mad":
+            median = np.nanmedian(values, axis=0)
+            mad = np.nanmedian(np.abs(values - median), axis=0)
+            return bounds_from_spread(median, MAD_SCALE * mad, MAD_THRESHOLD)
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        # Centered on the midhinge, q1 - k*IQR .. q3 + k*IQR is midhinge ± (k + 0.5) * IQR.
+        return bounds_from_spread((q1 + q3) / 2, q3 - q1, IQR_FACTOR + 0.5)
+
+
+def outlier_mask(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Element-wise outlier flags; NaN values and NaN bounds never count."""
+    return (values < low) | (values > high)
+
+
+def count_outliers(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    return outlier_mask(values, low, high).sum(axis=0)
+
+
+def inlier_rows(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    return ~outlier_mask(values, low, high).any(axis=1)
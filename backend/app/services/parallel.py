@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from app.core.config import get_settings
+from app.services.analysis import AnalysisContext
+from app.services.ingestion import file_extension, read_frame
+
+settings = get_settings()
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+# known_columns key -> the DatasetStats attribute it stands in for.
+STATISTIC_KEYS = {
+    "null_count": "null_pct",
+    "basic_stats": "basic_stats",
+    "outliers": "outlier_counts",
+    "long_strings": "long_string_counts",
+}
+
+
+def column_group_statistics(
+    file_path: str,
+    columns: list[str],
+    outlier_mode: str,
+    keys: tuple[str, ...] = tuple(STATISTIC_KEYS),
+) -> dict[str, dict[str, Any]]:
+    """Per-column statistics for one column group, in ``AnalysisContext.known_columns`` form.
+
+    Runs in a worker process and reads only its own columns from the Parquet file,
+    so no DataFrame is pickled between processes.
+    """
+    ctx = AnalysisContext(frame=read_frame(file_path, columns=columns), outlier_mode=outlier_mode)
+    stats: dict[str, dict[str, Any]] = {col: {} for col in columns}
+    for col in columns:
+        if "null_count" in keys:
+            stats[col]["null_count"] = ctx.null_counts[col]
+        if "outliers" in keys:
+            stats[col]["outliers"] = ctx.outlier_counts.get(col, 0)
+        if "long_strings" in keys:
+            stats[col]["long_strings"] = ctx.long_string_counts.get(col, 0)
+        if "basic_stats" in keys and col in ctx.basic_stats:
+            stats[col]["basic_stats"] = ctx.basic_stats[col]
+    return stats
+
+
+def _worker_count() -> int:
+    return min(settings.column_workers, os.cpu_count() or 1)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=_worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _column_groups(columns: list[str], groups: int) -> list[list[str]]:
+    size = -(-len(columns) // groups)
+    return [columns[i:i + size] for i in range(0, len(columns), size)]
+
+
+def can_parallelize(file_path: str, columns: list[str]) -> bool:
+    # Celery's prefork children are daemonic and may not start processes of their own.
+    return (
+        _worker_count() > 1
+        and len(columns) >= settings.parallel_min_columns
+        and file_extension(file_path) == ".parquet"
+        and not multiprocessing.current_process().daemon
+    )
+
+
+def parallel_column_statistics(
+    file_path: str,
+    columns: list[str],
+    outlier_mode: str,
+    statistics: set[str],
+) -> dict[str, dict[str, Any]]:
+    """Compute the requested per-column statistics with column groups spread over worker processes.
+
+    ``statistics`` names DatasetStats attributes; only their per-column parts are computed.
+    Groups are contiguous slices of ``columns`` and results are merged back in column
+    order, so the output does not depend on which worker finishes first.
+    """
+    keys = tuple(key for key, attr in STATISTIC_KEYS.items() if attr in statistics)
+    executor = _get_executor()
+    futures = [
+        executor.submit(column_group_statistics, file_path, group, outlier_mode, keys)
+        for group in _column_groups(columns, _worker_count())
+    ]
+    merged: dict[str, dict[str, Any]] = {}
+    for future in futures:
+        merged.update(future.result())
+    return {col: merged[col] for col in columns}
+
+
+def shutdown_column_workers() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
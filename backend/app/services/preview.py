@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.ingestion import iter_frames
+
+PREVIEW_VERSION = 1
+
+
+def preview_path_for(file_path: str) -> str:
+    # Shared by an upload and its columnar copy, like the schema sidecar.
+    return f"{os.path.splitext(file_path)[0]}.preview.json"
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _json_rows(df: pd.DataFrame) -> list[list[Any]]:
+    return df.astype(object).where(df.notna(), None).to_numpy().tolist()
+
+
+def build_preview(file_path: str, head_rows: int, sample_rows: int, chunksize: int = 100_000) -> dict[str, Any]:
+    """First ``head_rows`` rows plus a uniform sample of ``sample_rows`` of the remaining rows.
+
+    The sample is a bottom-k reservoir over seeded random keys, so it is built in one
+    chunked pass and the same file always yields the same rows; sampled rows are kept
+    in file order with their 0-based row numbers.
+    """
+    rng = np.random.default_rng(0)
+    columns: list[str] | None = None
+    head: list[pd.DataFrame] = []
+    head_count = 0
+    sample_keys = np.empty(0)
+    sample_numbers = np.empty(0, dtype=np.int64)
+    sample: pd.DataFrame | None = None
+    rows = 0
+
+    for chunk in iter_frames(file_path, chunksize):
+        if columns is None:
+            columns = chunk.columns.tolist()
+        start = rows
+        rows += len(chunk)
+        if head_count < head_rows:
+            taken = chunk.iloc[: head_rows - head_count]
+            head.append(taken)
+            head_count += len(taken)
+            chunk = chunk.iloc[len(taken):]
+            start += len(taken)
+        if sample_rows <= 0 or chunk.empty:
+            continue
+
+        chunk_keys = rng.random(len(chunk))
+        chunk_numbers = np.arange(start, start + len(chunk))
+        if len(chunk) > sample_rows:
+            # Only the chunk's own bottom-k can enter the reservoir.
+            local = np.sort(np.argpartition(chunk_keys, sample_rows)[:sample_rows])
+            chunk, chunk_keys, chunk_numbers = chunk.iloc[local], chunk_keys[local], chunk_numbers[local]
+        keys = np.concatenate([sample_keys, chunk_keys])
+        numbers = np.concatenate([sample_numbers, chunk_numbers])
+        candidates = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+        if len(keys) > sample_rows:
+            keep = np.sort(np.argpartition(keys, sample_rows)[:sample_rows])
+            keys, numbers, candidates = keys[keep], numbers[keep], candidates.iloc[keep]
+        sample_keys, sample_numbers, sample = keys, numbers, candidates.reset_index(drop=True)
+
+    head_frame = pd.concat(head, ignore_index=True) if head else pd.DataFrame(columns=columns or [])
+    return {
+        "version": PREVIEW_VERSION,
+        "columns": columns or [],
+        "rows": rows,
+        "head": _json_rows(head_frame),
+        "sample_row_numbers": sample_numbers.tolist(),
+        "sample": _json_rows(sample) if sample is not None else [],
+    }
+
+
+def ensure_preview(file_path: str, head_rows: int, sample_rows: int, chunksize: int = 100_000) -> str:
+    """Build the preview artifact next to ``file_path`` unless it already exists; returns its path."""
+    path = preview_path_for(file_path)
+    if os.path.exists(path):
+        return path
+    preview = build_preview(file_path, head_rows, sample_rows, chunksize)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "w") as handle:
+            json.dump(preview, handle, default=_json_value)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+@lru_cache(maxsize=128)
+def _load(path: str, mtime_ns: int) -> dict[str, Any] | None:
+    with open(path) as handle:
+        preview = json.load(handle)
+    return preview if preview.get("version") == PREVIEW_VERSION else None
+
+
+def load_preview(file_path: str) -> dict[str, Any] | None:
+    """The parsed preview artifact for ``file_path``, or None when it has not been built."""
+    path = preview_path_for(file_path)
+    try:
+        return _load(path, os.stat(path).st_mtime_ns)
+    except (OSError, ValueError):
+        return None
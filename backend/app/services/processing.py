@@ -1,16 +1,222 @@
 from __future__ import annotations
 
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from app.core.config import get_settings
+from app.services.analysis import AnalysisContext, DatasetStats
+from app.services.cache import fingerprint
+from app.services.cleaning import CleaningDelta, CleaningOutcome, clean_file
+from app.services.ingestion import (
+    CSV_EXTENSIONS,
+    convert_to_columnar,
+    dataset_size_bytes,
+    ensure_schema,
+    file_extension,
+    read_columns,
+)
+from app.services.metrics import StageRecorder
+from app.services.parallel import can_parallelize, parallel_column_statistics, shutdown_column_workers
+from app.services.preview import ensure_preview
 from app.services.profiling import profile_dataset
-from app.services.validation import validate_dataset
-from app.services.llm import summarize_issues, generate_cleaning_plan
+from app.services.rowindex import ensure_row_index
+from app.services.schema import plain_dtypes
+from app.services.streaming import StreamingAnalysis
+from app.services.rules import enabled_rules, required_statistics
+from app.services.validation import build_issues_with_timings
+from app.services.llm import summarize_and_plan
+
+settings = get_settings()
+
+
+# Bump when profiling or validation output changes so results from older code are not reused.
+ANALYSIS_VERSION = 2
+
+
+def analysis_fingerprint() -> str:
+    """Digest of the code version and settings that shape a validation result."""
+    return fingerprint({
+        "version": ANALYSIS_VERSION,
+        "validation_rules": settings.validation_rules_list,
+        "outlier_mode": settings.outlier_mode,
+        "infer_dtypes": settings.infer_dtypes,
+        "dtype_sample_rows": settings.dtype_sample_rows,
+        "stream_threshold_mb": settings.stream_threshold_mb,
+        "stream_chunk_rows": settings.stream_chunk_rows,
+        "approximate_duplicates": settings.approximate_duplicates,
+        "hll_precision": settings.hll_precision,
+    })
+
+
+def prepare_dataset(file_path: str) -> str | None:
+    """Build the per-upload artifacts: column schema, CSV row index, columnar copy and preview.
+
+    Each step is skipped when its artifact already exists. Returns the columnar
+    copy's path, or None when there is none.
+    """
+    if settings.infer_dtypes:
+        ensure_schema(file_path, settings.dtype_sample_rows)
+    if file_extension(file_path) in CSV_EXTENSIONS:
+        ensure_row_index(file_path)
+    columnar_path = None
+    if settings.columnar_storage:
+        columnar_path = convert_to_columnar(file_path, settings.stream_chunk_rows)
+    ensure_preview(
+        columnar_path or file_path,
+        settings.preview_head_rows,
+        settings.preview_sample_rows,
+        settings.stream_chunk_rows,
+    )
+    return columnar_path
+
+
+def open_analysis(file_path: str) -> DatasetStats:
+    if dataset_size_bytes(file_path) > settings.stream_threshold_bytes:
+        return StreamingAnalysis(
+            file_path,
+            chunksize=settings.stream_chunk_rows,
+            approximate_duplicates=settings.approximate_duplicates,
+            hll_precision=settings.hll_precision,
+            outlier_mode=settings.outlier_mode,
+        )
+    return AnalysisContext(
+        file_path,
+        outlier_mode=settings.outlier_mode,
+        known_columns=_column_statistics(file_path),
+    )
+
+
+def _column_statistics(file_path: str) -> dict[str, dict] | None:
+    """Per-column statistics of wide columnar files, computed across worker processes.
+
+    Returns None (serial computation in AnalysisContext) for narrow or CSV files and
+    when the worker pool breaks.
+    """
+    columns = read_columns(file_path)
+    if not can_parallelize(file_path, columns):
+        return None
+    try:
+        # Profiles always report null rates and basic stats; the rest depends on the enabled rules.
+        statistics = {"null_pct", "basic_stats"} | required_statistics(enabled_rules(settings.validation_rules_list))
+        return parallel_column_statistics(file_path, columns, settings.outlier_mode, statistics)
+    except BrokenProcessPool:
+        shutdown_column_workers()
+        return None
+
+
+def build_report(ctx: DatasetStats, recorder: StageRecorder) -> tuple[dict, list[dict], int]:
+    with recorder.stage("profile", rows=ctx.rows):
+        profile = profile_dataset(ctx)
+    with recorder.stage("validate", rows=ctx.rows):
+        issues, score, rule_timings = build_issues_with_timings(ctx, settings.validation_rules_list)
+    profile["rule_timings_ms"] = rule_timings
+    return profile, issues, score
+
+
+def _analyze(file_path: str, recorder: StageRecorder) -> tuple[dict, list[dict], int]:
+    # Reading the row count forces the parse (or the first streaming pass).
+    with recorder.stage("parse", bytes=dataset_size_bytes(file_path)) as stage:
+        ctx = open_analysis(file_path)
+        stage["rows"] = ctx.rows
+    return build_report(ctx, recorder)
 
 
 def run_validation(
     file_path: str,
     use_llm: bool = False,
-) -> tuple[dict, list[dict], int, str | None, dict | None]:
-    profile = profile_dataset(file_path)
-    issues, score = validate_dataset(file_path)
-    llm_summary = summarize_issues(issues) if use_llm else None
-    cleaning_plan = generate_cleaning_plan(issues) if use_llm else None
-    return profile, issues, score, llm_summary, cleaning_plan
+) -> tuple[dict, list[dict], int, str | None, dict | None, dict]:
+    """Profile and validate a file; the last element holds per-stage metrics."""
+    recorder = StageRecorder()
+    profile, issues, score = _analyze(file_path, recorder)
+    llm_summary, cleaning_plan = None, None
+    if use_llm:
+        with recorder.stage("llm"):
+            llm_summary, cleaning_plan = summarize_and_plan(issues)
+    return profile, issues, score, llm_summary, cleaning_plan, recorder.as_dict()
+
+
+def _carried_over_columns(
+    profile: dict,
+    issues: list[dict],
+    delta: CleaningDelta,
+    frame: pd.DataFrame,
+) -> dict[str, dict]:
+    """Per-column statistics of the source report that cleaning provably left unchanged.
+
+    Only columns whose values were neither filled nor converted qualify, and only
+    when no rows were removed; otherwise every column statistic may have moved.
+    """
+    rows = profile.get("rows")
+    if delta.rows_removed or not rows or rows != delta.rows_before:
+        return {}
+
+    counts_by_type: dict[str, dict[str, int]] = {"numeric_outliers": {}, "string_length": {}}
+    for issue in issues:
+        if issue.get("type") in counts_by_type and "column" in issue:
+            counts_by_type[issue["type"]][issue["column"]] = issue.get("count", 0)
+
+    basic_stats = profile.get("basic_stats", {})
+    dtypes = profile.get("dtypes", {})
+    known: dict[str, dict] = {}
+    for col, null_pct in profile.get("null_pct", {}).items():
+        if col in delta.changed_columns or dtypes.get(col) != str(frame[col].dtype):
+            continue
+        known[col] = {
+            "null_count": int(round(null_pct * rows)),
+            # Issues are only raised for non-zero counts, so a missing issue means zero.
+            "outliers": counts_by_type["numeric_outliers"].get(col, 0),
+            "long_strings": counts_by_type["string_length"].get(col, 0),
+        }
+        if col in basic_stats:
+            known[col]["basic_stats"] = basic_stats[col]
+    return known
+
+
+def revalidate_cleaned(
+    outcome: CleaningOutcome,
+    source_profile: dict | None = None,
+    source_issues: list[dict] | None = None,
+    recorder: StageRecorder | None = None,
+) -> tuple[dict, list[dict], int]:
+    """Report on a cleaned file from the frame cleaning already holds.
+
+    ``source_profile``/``source_issues`` describe the data that was cleaned; statistics
+    of columns the cleaning did not touch are carried over instead of recomputed.
+    Chunked cleaning keeps no frame and falls back to analyzing the cleaned file.
+    """
+    recorder = recorder or StageRecorder()
+    if outcome.frame is None:
+        return _analyze(outcome.path, recorder)
+
+    # The cleaned file is CSV and has no inferred schema, so compact types read back as
+    # their plain counterparts and converted datetime columns as objects.
+    frame = plain_dtypes(outcome.frame)
+    datetimes = [col for col, dtype in frame.dtypes.items() if pd.api.types.is_datetime64_any_dtype(dtype)]
+    if datetimes:
+        frame = frame.astype({col: object for col in datetimes})
+
+    known_columns = {}
+    if source_profile is not None and frame.columns.tolist() == source_profile.get("columns"):
+        known_columns = _carried_over_columns(source_profile, source_issues or [], outcome.delta, frame)
+    ctx = AnalysisContext(
+        frame=frame,
+        outlier_mode=settings.outlier_mode,
+        known_columns=known_columns,
+        known_duplicate_rows=0 if outcome.delta.duplicates_resolved else None,
+    )
+    return build_report(ctx, recorder)
+
+
+def clean_and_revalidate(
+    file_path: str,
+    plan: dict | None,
+    cleaned_dir: str,
+    source_profile: dict | None = None,
+    source_issues: list[dict] | None = None,
+) -> tuple[str, dict, list[dict], int, dict]:
+    """Clean a file and report on the result in one call, returning only picklable values."""
+    recorder = StageRecorder()
+    outcome = clean_file(file_path, plan, cleaned_dir, recorder)
+    profile, issues, score = revalidate_cleaned(outcome, source_profile, source_issues, recorder)
+    return outcome.path, profile, issues, score, recorder.as_dict()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import redis
+
+
+# Refills two buckets (requests and tokens) and takes from both only if both can pay,
+# so a request never consumes request budget it cannot use. Uses the Redis clock so
+# every worker sees the same time.
+_TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local ok = true
+local levels = {}
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[(i - 1) * 2 + 1])
+    local cost = tonumber(ARGV[(i - 1) * 2 + 2])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * capacity / 60)
+    levels[i] = tokens
+    if tokens < cost then ok = false end
+end
+for i = 1, #KEYS do
+    local cost = tonumber(ARGV[(i - 1) * 2 + 2])
+    local tokens = levels[i]
+    if ok then tokens = tokens - cost end
+    redis.call('HSET', KEYS[i], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+if ok then return 1 end
+return 0
+"""
+
+
+def connect_redis(redis_url: str | None) -> redis.Redis | None:
+    if not redis_url:
+        return None
+    return redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+class RedisBacked:
+    """Optional Redis connection that is skipped for ``redis_retry_seconds`` after an error,
+    so a dead Redis host does not add a socket timeout to every call."""
+
+    def __init__(self, redis_url: str | None, redis_retry_seconds: float = 30.0):
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis = connect_redis(redis_url)
+        self._redis_down_until = 0.0
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _mark_redis_down(self) -> None:
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+
+
+class _LocalBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+
+class RateLimiter(RedisBacked):
+    """Per-minute request and token buckets shared by all workers through Redis.
+
+    ``try_acquire`` never waits for budget: callers that are over budget should fall
+    back instead. Without Redis (or while it is down) the buckets are enforced per
+    process. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, name: str, redis_url: str | None, requests_per_minute: int, tokens_per_minute: int):
+        super().__init__(redis_url)
+        self.name = name
+        self.limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self._script = self._redis.register_script(_TAKE_SCRIPT) if self._redis is not None else None
+        self._local = {kind: _LocalBucket(limit) for kind, limit in self.limits.items() if limit > 0}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        costs = {"requests": 1, "tokens": tokens}
+        active = {kind: costs[kind] for kind, limit in self.limits.items() if limit > 0}
+        if not active:
+            return True
+
+        if self._script is not None and self._redis_available():
+            keys = [f"ratelimit:{self.name}:{kind}" for kind in active]
+            args: list[float] = []
+            for kind, cost in active.items():
+                args.extend([self.limits[kind], cost])
+            try:
+                return bool(self._script(keys=keys, args=args))
+            except redis.RedisError:
+                self._mark_redis_down()
+
+        with self._lock:
+            for bucket in self._local.values():
+                bucket.refill()
+            if any(self._local[kind].tokens < cost for kind, cost in active.items()):
+                return False
+            for kind, cost in active.items():
+                self._local[kind].tokens -= cost
+            return True
+
+
+class CircuitBreaker(RedisBacked):
+    """Opens after ``failure_threshold`` consecutive failures, shared through Redis.
+
+    While open, ``allow`` returns False until ``reset_seconds`` (or the provider's
+    Retry-After) has passed. The circuit is then half-open: ``allow`` admits a single
+    probe and keeps rejecting everyone else until the probe records success (closing
+    the circuit) or failure (re-opening it). A probe that never reports back is
+    replaced after ``probe_timeout_seconds``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis_url: str | None,
+        failure_threshold: int,
+        reset_seconds: float,
+        probe_timeout_seconds: float | None = None,
+    ):
+        super().__init__(redis_url)
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds or reset_seconds
+        self._key = f"breaker:{name}"
+        self._probe_key = f"breaker:{name}:probe"
+        self._failures = 0
+        self._open_until = 0.0
+        self._probe_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        now = time.time()
+        if self._redis_available():
+            try:
+                open_until = self._redis.hget(self._key, "open_until")
+                if open_until is None:
+                    return True
+                if float(open_until) > now:
+                    return False
+                return bool(self._redis.set(self._probe_key, 1, nx=True, px=int(self.probe_timeout_seconds * 1000)))
+            except redis.RedisError:
+                self._mark_redis_down()
+        with self._lock:
+            if not self._open_until:
+                return True
+            if self._open_until > now or self._probe_until > now:
+                return False
+            self._probe_until = now + self.probe_timeout_seconds
+            return True
+
+    def record_success(self) -> None:
+        if self._redis_available():
+            try:
+                self._redis.delete(self._key, self._probe_key)
+                return
+            except redis.RedisError:
+                self._mark_redis_down()
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+            self._probe_until = 0.0
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        now = time.time()
+        if self._redis_available():
+            try:
+                failures = self._redis.hincrby(self._key, "failures", 1)
+                if retry_after or failures >= self.failure_threshold:
+                    self._redis.hset(self._key, "open_until", now + (retry_after or self.reset_seconds))
+                # Forget stale failures so old incidents do not count against a healthy provider.
+                self._redis.expire(self._key, int(max(self.reset_seconds, retry_after or 0) * 10))
+                self._redis.delete(self._probe_key)
+                return
+            except redis.RedisError:
+                self._mark_redis_down()
+        with self._lock:
+            self._failures += 1
+            if retry_after or self._failures >= self.failure_threshold:
+                self._open_until = now + (retry_after or self.reset_seconds)
+            self._probe_until = 0.0
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import csv
+import glob
+import io
+import json
+import os
+import uuid
+
+from fpdf import FPDF
+
+from app.models.validation_result import ValidationResult
+from app.utils.files import ensure_dir
+
+# Bump when an export layout changes so cached artifacts are not reused.
+EXPORT_VERSION = 1
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "pdf": "application/pdf",
+}
+
+
+def _report_content(result: ValidationResult) -> dict:
+    return {
+        "dataset_id": str(result.dataset_id),
+        "quality_score": result.quality_score,
+        "issues": result.issues_json,
+        "profile": result.profile_json,
+        "llm_summary": result.llm_summary,
+        "cleaning_plan": result.cleaning_plan_json,
+        "created_at": result.created_at.isoformat(),
+    }
+
+
+def render_report_json(result: ValidationResult, dataset_name: str) -> bytes:
+    # Same encoding as FastAPI's JSONResponse.
+    return json.dumps(
+        _report_content(result),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_report_csv(result: ValidationResult, dataset_name: str) -> bytes:
+    output = io.StringIO()
+    writer = csv.DictWriter(
+        output,
+        fieldnames=["type", "message", "column", "count", "null_pct"],
+    )
+    writer.writeheader()
+
+    issues = result.issues_json or []
+    if not issues:
+        writer.writerow({"type": "none", "message": "No issues detected"})
+    else:
+        for issue in issues:
+            writer.writerow({
+                "type": issue.get("type"),
+                "message": issue.get("message"),
+                "column": issue.get("column"),
+                "count": issue.get("count"),
+                "null_pct": issue.get("null_pct"),
+            })
+    return output.getvalue().encode("utf-8")
+
+
+def render_report_pdf(result: ValidationResult, dataset_name: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=12)
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, "Data Quality Report", ln=True)
+
+    pdf.set_font("Helvetica", size=11)
+    pdf.cell(0, 8, f"Dataset: {dataset_name}", ln=True)
+    pdf.cell(0, 8, f"Created at: {result.created_at.isoformat()}", ln=True)
+    pdf.cell(0, 8, f"Quality score: {result.quality_score}", ln=True)
+    pdf.cell(0, 8, f"Issues count: {len(result.issues_json or [])}", ln=True)
+    pdf.ln(4)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Summary", ln=True)
+    pdf.set_font("Helvetica", size=10)
+    summary = result.llm_summary or "No LLM summary available."
+    pdf.multi_cell(0, 6, summary)
+    pdf.ln(2)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Issues", ln=True)
+    pdf.set_font("Helvetica", size=10)
+    if not result.issues_json:
+        pdf.multi_cell(0, 6, "No issues detected.")
+    else:
+        for issue in result.issues_json[:25]:
+            line = f"- {issue.get('type', 'issue')}: {issue.get('message', '')}"
+            pdf.multi_cell(0, 6, line)
+    pdf.ln(2)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Cleaning Plan", ln=True)
+    pdf.set_font("Helvetica", size=10)
+    plan = result.cleaning_plan_json or {}
+    steps = plan.get("steps", []) if isinstance(plan, dict) else []
+    if not steps:
+        pdf.multi_cell(0, 6, "No cleaning plan available.")
+    else:
+        for step in steps[:20]:
+            pdf.multi_cell(0, 6, f"- {step.get('action')}: {step.get('details')}")
+
+    return bytes(pdf.output())
+
+
+RENDERERS = {
+    "json": render_report_json,
+    "csv": render_report_csv,
+    "pdf": render_report_pdf,
+}
+
+
+def report_etag(result: ValidationResult, fmt: str) -> str:
+    return f'"{result.id}-{fmt}-{result.content_version}.{EXPORT_VERSION}"'
+
+
+def report_path(result: ValidationResult, fmt: str, report_dir: str) -> str:
+    return os.path.join(report_dir, f"{result.id}-{result.content_version}.{EXPORT_VERSION}.{fmt}")
+
+
+def cached_report(result: ValidationResult, fmt: str, dataset_name: str, report_dir: str) -> str:
+    """Path of the rendered export, rendering and storing it on first use."""
+    ensure_dir(report_dir)
+    path = report_path(result, fmt, report_dir)
+    if os.path.exists(path):
+        return path
+    content = RENDERERS[fmt](result, dataset_name)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(content)
+    os.replace(tmp_path, path)
+    # Earlier versions of the same export are stale once a new one exists.
+    for stale in glob.glob(os.path.join(report_dir, f"{result.id}-*.{fmt}")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from sqlalchemy.orm import Session
+
+from app.models.dataset import Dataset
+from app.models.validation_result import ValidationResult
+from app.services.processing import analysis_fingerprint
+
+
+def count_issue_types(issues: list[dict]) -> dict[str, int]:
+    return dict(Counter(issue.get("type", "issue") for issue in issues))
+
+
+def record_validation_result(
+    db: Session,
+    dataset: Dataset,
+    profile: dict,
+    issues: list[dict],
+    score: int,
+    llm_summary: str | None = None,
+    cleaning_plan: dict | None = None,
+    content_hash: str | None = None,
+    metrics: dict | None = None,
+) -> ValidationResult:
+    result = ValidationResult(
+        dataset_id=dataset.id,
+        quality_score=score,
+        issues_json=issues,
+        issues_count=len(issues),
+        issue_type_counts=count_issue_types(issues),
+        profile_json=profile,
+        llm_summary=llm_summary,
+        cleaning_plan_json=cleaning_plan,
+        content_hash=content_hash,
+        analysis_fingerprint=analysis_fingerprint(),
+        metrics_json=metrics,
+    )
+    db.add(result)
+    dataset.latest_result = result
+    return result
+
+
+def find_reusable_result(db: Session, content_hash: str | None) -> ValidationResult | None:
+    """Latest analysis of byte-identical content, from any dataset, made with the current settings."""
+    if not content_hash:
+        return None
+    return (
+        db.query(ValidationResult)
+        .filter(
+            ValidationResult.content_hash == content_hash,
+            ValidationResult.analysis_fingerprint == analysis_fingerprint(),
+        )
+        .order_by(ValidationResult.created_at.desc())
+        .first()
+    )
+
+
+def reuse_validation_result(db: Session, dataset: Dataset, source: ValidationResult) -> ValidationResult:
+    return record_validation_result(
+        db,
+        dataset,
+        profile=source.profile_json,
+        issues=source.issues_json,
+        score=source.quality_score,
+        llm_summary=source.llm_summary,
+        cleaning_plan=source.cleaning_plan_json,
+        content_hash=source.content_hash,
+    )
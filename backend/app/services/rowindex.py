@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+
+# Every STRIDE-th row start is stored; a lookup scans at most STRIDE - 1 rows from there.
+ROW_INDEX_STRIDE = 1024
+_BLOCK_BYTES = 16 * 2**20
+_QUOTE = ord('"')
+_NEWLINE = ord("\n")
+_CARRIAGE_RETURN = ord("\r")
+
+
+def rowindex_path_for(file_path: str) -> str:
+    return f"{os.path.splitext(file_path)[0]}.rowidx.npz"
+
+
+def _record_starts(block: np.ndarray, base: int, in_quotes: bool) -> tuple[np.ndarray, bool]:
+    """Offsets just past each record-terminating newline in ``block``, and the quote state after it.
+
+    A newline ends a record only outside a quoted field, i.e. after an even number of
+    quote characters; escaped quotes ("") come in pairs and keep the parity.
+    """
+    quotes = np.flatnonzero(block == _QUOTE)
+    newlines = np.flatnonzero(block == _NEWLINE)
+    outside = (np.searchsorted(quotes, newlines) + in_quotes) % 2 == 0
+    return newlines[outside] + base + 1, (len(quotes) + in_quotes) % 2 == 1
+
+
+def _drop_blank(data: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    # The CSV parser skips blank lines, so they must not count as rows.
+    first = data[starts]
+    following = data[np.minimum(starts + 1, len(data) - 1)]
+    blank = (first == _NEWLINE) | ((first == _CARRIAGE_RETURN) & (following == _NEWLINE))
+    return starts[~blank]
+
+
+def _iter_record_starts(data: np.ndarray, begin: int, end: int):
+    """Record starts in ``data[begin:end]``, block by block; ``begin`` must be a record boundary."""
+    in_quotes = False
+    for block_start in range(begin, end, _BLOCK_BYTES):
+        block_end = min(block_start + _BLOCK_BYTES, end)
+        found, in_quotes = _record_starts(data[block_start:block_end], block_start, in_quotes)
+        yield found[found < len(data)]
+
+
+def _scan(data: np.ndarray, begin: int, end: int) -> np.ndarray:
+    """Non-blank record starts in ``data[begin:end]``."""
+    starts = [_drop_blank(data, found) for found in _iter_record_starts(data, begin, end)]
+    return np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class RowIndex:
+    checkpoints: np.ndarray
+    rows: int
+    header_end: int
+    size: int
+    stride: int = ROW_INDEX_STRIDE
+
+    def byte_range(self, data: np.ndarray, start: int, stop: int) -> tuple[int, int]:
+        """Byte span of rows ``start``..``stop - 1``, scanning from the nearest checkpoints."""
+        start, stop = max(0, start), min(stop, self.rows)
+        if start >= stop:
+            return self.size, self.size
+        first = start // self.stride
+        last = -(-stop // self.stride)
+        scan_end = int(self.checkpoints[last]) if last < len(self.checkpoints) else self.size
+        begin = int(self.checkpoints[first])
+        bounds = np.concatenate([[begin], _scan(data, begin, scan_end)])
+        row_begin = int(bounds[start - first * self.stride])
+        end_at = stop - first * self.stride
+        row_end = int(bounds[end_at]) if end_at < len(bounds) else scan_end
+        return row_begin, row_end
+
+
+def build_row_index(file_path: str, stride: int = ROW_INDEX_STRIDE) -> RowIndex:
+    """Index the row starts of a CSV file in one pass over a memory map."""
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return RowIndex(np.empty(0, dtype=np.uint64), 0, 0, 0, stride)
+    data = np.memmap(file_path, dtype=np.uint8, mode="r")
+    checkpoints = []
+    rows = 0
+    header_end = None
+    for found in _iter_record_starts(data, 0, size):
+        if header_end is None and len(found):
+            # The first record boundary ends the header and starts row 0.
+            header_end = int(found[0])
+        found = _drop_blank(data, found)
+        # Keep the starts of rows rows, rows + stride, ... that fall in this block.
+        checkpoints.append(found[(-rows) % stride::stride])
+        rows += len(found)
+    return RowIndex(
+        np.concatenate(checkpoints).astype(np.uint64),
+        rows,
+        size if header_end is None else header_end,
+        size,
+        stride,
+    )
+
+
+def save_row_index(file_path: str, index: RowIndex) -> str:
+    path = rowindex_path_for(file_path)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.npz"
+    try:
+        np.savez(
+            tmp_path,
+            checkpoints=index.checkpoints,
+            meta=np.array([index.rows, index.header_end, index.size, index.stride], dtype=np.uint64),
+        )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def load_row_index(file_path: str) -> RowIndex | None:
+    try:
+        with np.load(rowindex_path_for(file_path)) as stored:
+            rows, header_end, size, stride = (int(value) for value in stored["meta"])
+            checkpoints = stored["checkpoints"]
+    except (OSError, KeyError, ValueError):
+        return None
+    if size != os.path.getsize(file_path):
+        return None
+    return RowIndex(checkpoints, rows, header_end, size, stride)
+
+
+def ensure_row_index(file_path: str) -> RowIndex:
+    index = load_row_index(file_path)
+    if index is None:
+        index = build_row_index(file_path)
+        save_row_index(file_path, index)
+    return index
+
+
+def read_byte_rows(file_path: str, index: RowIndex, start: int, stop: int) -> bytes:
+    """The header line plus the raw bytes of rows ``start``..``stop - 1``, read through a memory map."""
+    if index.size == 0:
+        return b""
+    data = np.memmap(file_path, dtype=np.uint8, mode="r")
+    begin, end = index.byte_range(data, start, stop)
+    return data[:index.header_end].tobytes() + data[begin:end].tobytes()
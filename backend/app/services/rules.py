@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from app.services.analysis import LONG_STRING_CHARS, DatasetStats
+from app.services.outliers import RULE_LABELS
+
+NULL_RATE_THRESHOLD = 0.05
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    # DatasetStats attributes the rule reads; the engine materializes each one once.
+    requires: tuple[str, ...]
+    check: Callable[[DatasetStats], list[dict]]
+
+
+RULES: dict[str, Rule] = {}
+
+
+def register_rule(name: str, requires: Iterable[str]) -> Callable[[Callable], Callable]:
+    """Register a check under ``name``; rules run in registration order."""
+    requires = tuple(requires)
+    unknown = set(requires) - DatasetStats.__annotations__.keys()
+    if unknown:
+        raise ValueError(f"Rule {name} requires unknown statistics: {', '.join(sorted(unknown))}")
+
+    def decorator(check: Callable[[DatasetStats], list[dict]]) -> Callable[[DatasetStats], list[dict]]:
+        RULES[name] = Rule(name, requires, check)
+        return check
+
+    return decorator
+
+
+@register_rule("primary_key", requires=("pk_column", "pk_null_count", "pk_duplicate_count", "pk_duplicate_detection"))
+def check_primary_key(ctx: DatasetStats) -> list[dict]:
+    pk_col = ctx.pk_column
+    if not pk_col:
+        return [{
+            "type": "missing_primary_key",
+            "message": "No primary key column found (expected one of: id, pk, primary_key).",
+        }]
+
+    issues: list[dict] = []
+    nulls = ctx.pk_null_count
+    dups = ctx.pk_duplicate_count
+    if nulls > 0:
+        issues.append({
+            "type": "primary_key_nulls",
+            "column": pk_col,
+            "count": nulls,
+            "message": f"{nulls} null primary key values in {pk_col}",
+        })
+    if dups > 0:
+        issues.append({
+            "type": "primary_key_duplicates",
+            "column": pk_col,
+            "count": dups,
+            **ctx.pk_duplicate_detection,
+            "message": f"{dups} duplicate primary key values in {pk_col}",
+        })
+    return issues
+
+
+@register_rule("null_rate", requires=("null_pct",))
+def check_null_rate(ctx: DatasetStats) -> list[dict]:
+    return [
+        {
+            "type": "high_null_rate",
+            "column": col,
+            "null_pct": col_null_pct,
+            "message": f"{col} has {col_null_pct:.1%} nulls",
+        }
+        for col, col_null_pct in ctx.null_pct.items()
+        if col_null_pct >= NULL_RATE_THRESHOLD
+    ]
+
+
+@register_rule("duplicate_rows", requires=("duplicate_rows", "duplicate_detection"))
+def check_duplicate_rows(ctx: DatasetStats) -> list[dict]:
+    dup_rows = ctx.duplicate_rows
+    if dup_rows <= 0:
+        return []
+    return [{
+        "type": "duplicate_rows",
+        "count": dup_rows,
+        **ctx.duplicate_detection,
+        "message": f"Dataset contains {dup_rows} duplicate rows",
+    }]
+
+
+@register_rule("numeric_outliers", requires=("outlier_counts",))
+def check_numeric_outliers(ctx: DatasetStats) -> list[dict]:
+    return [
+        {
+            "type": "numeric_outliers",
+            "column": col,
+            "count": outliers,
+            "message": f"{col} has {outliers} outliers ({RULE_LABELS[ctx.outlier_mode]})",
+        }
+        for col, outliers in ctx.outlier_counts.items()
+        if outliers > 0
+    ]
+
+
+@register_rule("string_length", requires=("long_string_counts",))
+def check_string_length(ctx: DatasetStats) -> list[dict]:
+    return [
+        {
+            "type": "string_length",
+            "column": col,
+            "count": long_count,
+            "message": f"{col} has {long_count} values longer than {LONG_STRING_CHARS} chars",
+        }
+        for col, long_count in ctx.long_string_counts.items()
+        if long_count > 0
+    ]
+
+
+def enabled_rules(names: Iterable[str] | None = None) -> list[Rule]:
+    """Rules to run, in registration order; None means all registered rules."""
+    if names is None:
+        return list(RULES.values())
+    wanted = set(names)
+    unknown = wanted - RULES.keys()
+    if unknown:
+        raise ValueError(f"Unknown validation rules: {', '.join(sorted(unknown))}")
+    return [rule for rule in RULES.values() if rule.name in wanted]
+
+
+def required_statistics(rules: Iterable[Rule]) -> set[str]:
+    return {stat for rule in rules for stat in rule.requires}
+
+
+def run_rules(ctx: DatasetStats, rules: list[Rule]) -> tuple[list[dict], dict[str, float]]:
+    """Run rules in order and return their issues plus per-rule wall time in milliseconds.
+
+    A statistic is computed the first time a rule requires it, and its cost is charged
+    to that rule; later rules reuse the memoized value.
+    """
+    issues: list[dict] = []
+    timings: dict[str, float] = {}
+    computed: set[str] = set()
+    for rule in rules:
+        started = time.perf_counter()
+        for stat in rule.requires:
+            if stat not in computed:
+                getattr(ctx, stat)
+                computed.add(stat)
+        issues.extend(rule.check(ctx))
+        timings[rule.name] = round((time.perf_counter() - started) * 1000, 3)
+    return issues, timings
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_VERSION = 1
+
+CATEGORY = "category"
+STRING = "string"
+NULLABLE_INT = "Int64"
+INT32 = "int32"
+
+# Low-cardinality text becomes categorical; anything else stays Arrow-backed strings.
+CATEGORY_MAX_UNIQUE = 1_000
+CATEGORY_MAX_RATIO = 0.5
+_FLOAT_EXACT_INT = 2**53
+_INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+ARROW_STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+@dataclass
+class DatasetSchema:
+    """Compact column types inferred from a sample; columns not listed keep pandas defaults."""
+
+    columns: dict[str, str] = field(default_factory=dict)
+    sample_rows: int = 0
+
+    def columns_of(self, kind: str) -> list[str]:
+        return [col for col, dtype in self.columns.items() if dtype == kind]
+
+    def csv_dtypes(self) -> dict[str, str]:
+        # Categories are parsed directly; any CSV cell is a valid category, so this cannot fail.
+        # Arrow strings are cheaper to build from the parsed objects than through the
+        # parser, and numeric narrowing is checked per frame, both in apply_schema.
+        return {col: CATEGORY for col in self.columns_of(CATEGORY)}
+
+    def to_dict(self) -> dict:
+        return {"version": SCHEMA_VERSION, "sample_rows": self.sample_rows, "columns": self.columns}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DatasetSchema | None:
+        if data.get("version") != SCHEMA_VERSION:
+            return None
+        return cls(columns=dict(data.get("columns", {})), sample_rows=int(data.get("sample_rows", 0)))
+
+
+def is_text_dtype(dtype) -> bool:
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.categories.dtype == object or pd.api.types.is_string_dtype(dtype.categories.dtype)
+    return dtype == object or pd.api.types.is_string_dtype(dtype)
+
+
+def is_plain_numeric(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _is_integral(values: np.ndarray) -> bool:
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return False
+    return bool(np.all(values == np.round(values)) and np.abs(values).max() < _FLOAT_EXACT_INT)
+
+
+def _fits_int32(series: pd.Series) -> bool:
+    return series.empty or (_INT32_RANGE[0] <= series.min() and series.max() <= _INT32_RANGE[1])
+
+
+def _infer_column(series: pd.Series) -> str | None:
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return None
+    if dtype == object:
+        values = series.dropna()
+        if values.empty or pd.api.types.infer_dtype(values, skipna=False) != "string":
+            return None
+        unique = values.nunique()
+        if unique <= CATEGORY_MAX_UNIQUE and unique <= CATEGORY_MAX_RATIO * len(values):
+            return CATEGORY
+        return STRING
+    if pd.api.types.is_float_dtype(dtype) and series.isna().any():
+        return NULLABLE_INT if _is_integral(series.to_numpy(dtype="float64")) else None
+    if pd.api.types.is_integer_dtype(dtype) and dtype.itemsize > 4:
+        # Only narrow to int32: the sample may not cover the full range, and each frame is
+        # re-checked before casting (see apply_schema).
+        return INT32 if _fits_int32(series) else None
+    return None
+
+
+def infer_schema(sample: pd.DataFrame) -> DatasetSchema:
+    columns = {}
+    for col in sample.columns:
+        kind = _infer_column(sample[col])
+        if kind is not None:
+            columns[col] = kind
+    return DatasetSchema(columns=columns, sample_rows=len(sample))
+
+
+def _cast(series: pd.Series, kind: str) -> pd.Series:
+    dtype = series.dtype
+    if kind == CATEGORY:
+        if isinstance(dtype, pd.CategoricalDtype) or not is_text_dtype(dtype):
+            return series
+        return series.astype(CATEGORY)
+    if kind == STRING:
+        if dtype == ARROW_STRING_DTYPE or dtype != object:
+            return series
+        if pd.api.types.infer_dtype(series, skipna=True) not in {"string", "empty"}:
+            return series
+        return series.astype(ARROW_STRING_DTYPE)
+    if kind == NULLABLE_INT:
+        # A frame without nulls parses as int64; cast it too so every frame agrees.
+        if dtype == NULLABLE_INT or not is_plain_numeric(dtype):
+            return series
+        if pd.api.types.is_float_dtype(dtype) and not _is_integral(series.to_numpy(dtype="float64")):
+            return series
+        return series.astype(NULLABLE_INT)
+    if kind == INT32:
+        if not pd.api.types.is_integer_dtype(dtype) or dtype.itemsize <= 4 or not _fits_int32(series):
+            return series
+        return series.astype(INT32)
+    return series
+
+
+def apply_schema(df: pd.DataFrame, schema: DatasetSchema | None) -> pd.DataFrame:
+    """Cast ``df`` to the schema's compact types where the values allow it.
+
+    A frame whose values do not fit the inferred type (e.g. a fraction in a column the
+    sample saw as integers) keeps its parsed dtype for that column.
+    """
+    if schema is None:
+        return df
+    casts = {}
+    for col, kind in schema.columns.items():
+        if col not in df.columns:
+            continue
+        series = df[col]
+        cast = _cast(series, kind)
+        if cast is not series:
+            casts[col] = cast
+    return _with_columns(df, casts)
+
+
+def _with_columns(df: pd.DataFrame, columns: dict[str, pd.Series]) -> pd.DataFrame:
+    if not columns:
+        return df
+    df = df.copy(deep=False)
+    for col, series in columns.items():
+        df[col] = series
+    return df
+
+
+def schema_path_for(file_path: str) -> str:
+    # Shared by an upload and its columnar copy, which differ only in extension.
+    return f"{os.path.splitext(file_path)[0]}.schema.json"
+
+
+def load_schema(file_path: str) -> DatasetSchema | None:
+    try:
+        with open(schema_path_for(file_path)) as handle:
+            return DatasetSchema.from_dict(json.load(handle))
+    except (OSError, ValueError):
+        return None
+
+
+def save_schema(file_path: str, schema: DatasetSchema) -> str:
+    path = schema_path_for(file_path)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "w") as handle:
+            json.dump(schema.to_dict(), handle)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def plain_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Undo the compact types, giving the dtypes a plain CSV read of the same values produces."""
+    casts = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) or (dtype != object and pd.api.types.is_string_dtype(dtype)):
+            casts[col] = df[col].astype(object).where(df[col].notna(), np.nan)
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_integer_dtype(dtype):
+            series = df[col]
+            casts[col] = series.astype("float64") if series.isna().any() else series.astype("int64")
+        elif pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < 8 and not pd.api.types.is_bool_dtype(dtype):
+            casts[col] = df[col].astype("int64")
+    return _with_columns(df, casts)
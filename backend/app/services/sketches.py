@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+_FLOAT_EXACT_INT = 2 ** 53
+
+
+def hash_rows(chunk: pd.DataFrame) -> np.ndarray:
+    # Numeric columns may come back as int in one chunk and float in the next;
+    # hash them as float64 (when that is lossless) so equal values collide
+    # regardless of the chunk they were parsed in.
+    normalized = chunk.copy(deep=False)
+    for col in chunk.columns:
+        series = chunk[col]
+        if pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            if series.empty or series.abs().max() < _FLOAT_EXACT_INT:
+                normalized[col] = series.astype("float64")
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (np.uint64(1) << np.uint64(shift))
+        length[high] += shift
+        values[high] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+class RowHashSet:
+    """Exact set of 64-bit digests stored as sorted runs that are merged LSM-style.
+
+    Membership is a binary search per run and there are O(log n) runs, so adding a
+    chunk costs O(chunk * log n) instead of re-sorting everything seen so far. With
+    ``track_positions`` each digest also remembers the order in which it was first added.
+    """
+
+    def __init__(self, track_positions: bool = False):
+        self._runs: list[np.ndarray] = []
+        self._positions: list[np.ndarray] | None = [] if track_positions else None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[pos] == hashes
+        return found
+
+    def positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Insertion position of each digest, or -1 where it has not been added."""
+        if self._positions is None:
+            raise ValueError("RowHashSet was created without track_positions")
+        found = np.full(len(hashes), -1, dtype=np.int64)
+        for run, run_positions in zip(self._runs, self._positions):
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            hit = run[pos] == hashes
+            found[hit] = run_positions[pos[hit]]
+        return found
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """Insert digests and return a mask of the ones not seen before (first occurrences).
+
+        New digests get consecutive positions in the order they appear in ``hashes``.
+        """
+        first_in_chunk = ~pd.Series(hashes).duplicated().to_numpy()
+        new = first_in_chunk & ~self.contains(hashes)
+        keys = hashes[new]
+        if len(keys):
+            positions = np.arange(self._size, self._size + len(keys), dtype=np.int64)
+            self._push_run(keys, positions)
+            self._size += len(keys)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer = self._runs.pop()
+            older = self._runs.pop()
+            positions = None
+            if self._positions is not None:
+                newer_positions = self._positions.pop()
+                positions = np.concatenate([self._positions.pop(), newer_positions])
+            self._push_run(np.concatenate([older, newer]), positions)
+        return new
+
+    def _push_run(self, keys: np.ndarray, positions: np.ndarray | None) -> None:
+        if self._positions is None:
+            self._runs.append(np.sort(keys, kind="stable"))
+            return
+        order = np.argsort(keys, kind="stable")
+        self._runs.append(keys[order])
+        self._positions.append(positions[order])
+
+
+class HyperLogLog:
+    """Mergeable cardinality sketch; ``2 ** precision`` one-byte registers."""
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        rank = (tail_bits - _bit_length(tail) + 1).astype(np.uint8)
+        best = pd.Series(rank).groupby(index).max()
+        slots = best.index.to_numpy()
+        self.registers[slots] = np.maximum(self.registers[slots], best.to_numpy())
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        zeros = int((self.registers == 0).sum())
+        if zeros:
+            # Without a bias-correction table the raw estimate overshoots by several
+            # percent up to ~3m; linear counting stays unbiased in that range.
+            linear = m * math.log(m / zeros)
+            if linear <= 3 * m:
+                return linear
+        return raw
+
+
+class DuplicateCounter:
+    """Counts duplicate digests chunk by chunk, exactly or via HyperLogLog."""
+
+    def __init__(self, approximate: bool = False, precision: int = 14):
+        self.approximate = approximate
+        self.total = 0
+        self._hll = HyperLogLog(precision) if approximate else None
+        self._seen = None if approximate else RowHashSet()
+
+    def add(self, hashes: np.ndarray) -> None:
+        self.total += len(hashes)
+        if self._hll is not None:
+            self._hll.add(hashes)
+        else:
+            self._seen.add(hashes)
+
+    @property
+    def distinct(self) -> int:
+        if self._hll is not None:
+            return min(self.total, int(round(self._hll.estimate())))
+        return len(self._seen)
+
+    @property
+    def duplicates(self) -> int:
+        return max(0, self.total - self.distinct)
+
+    @property
+    def detection(self) -> dict:
+        if self._hll is not None:
+            # The sketch estimates the distinct count; duplicates = total - distinct share its
+            # absolute error, which is reported in rows (one standard error).
+            return {
+                "method": "approximate",
+                "distinct_relative_error": round(self._hll.relative_error, 4),
+                "duplicates_error": int(math.ceil(self._hll.relative_error * self.distinct)),
+            }
+        return {"method": "exact"}
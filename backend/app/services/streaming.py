@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from app.services.analysis import PK_CANDIDATES, _serialize_value, count_long_strings
+from app.services.ingestion import iter_frames, read_columns
+from app.services.outliers import (
+    SIGMA_THRESHOLD,
+    bounds_from_spread,
+    count_outliers,
+    numeric_matrix,
+    outlier_bounds,
+)
+from app.services.schema import is_plain_numeric, is_text_dtype
+from app.services.sketches import DuplicateCounter, hash_rows
+
+
+QUANTILE_SAMPLE_SIZE = 20_000
+
+
+def merge_dtype(left: np.dtype | None, right: np.dtype) -> np.dtype:
+    if left is None or left == right:
+        return right
+    if isinstance(left, pd.CategoricalDtype) and isinstance(right, pd.CategoricalDtype):
+        # Each chunk parses its own category set.
+        return right
+    if is_plain_numeric(left) and is_plain_numeric(right):
+        if isinstance(left, np.dtype) and isinstance(right, np.dtype):
+            return np.promote_types(left, right)
+        return np.dtype("float64")
+    return np.dtype("object")
+
+
+class NumericAccumulator:
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._sample_keys = np.empty(0)
+        self._sample_values = np.empty(0)
+
+    def update(self, values: np.ndarray) -> None:
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return
+
+        # Chan et al. parallel update of the Welford running mean/variance.
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        # Bottom-k sampling on random keys keeps a uniform, mergeable sample for quantiles.
+        keys = np.concatenate([self._sample_keys, self._rng.random(n)])
+        sample = np.concatenate([self._sample_values, values])
+        if len(keys) > QUANTILE_SAMPLE_SIZE:
+            keep = np.argpartition(keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+            keys, sample = keys[keep], sample[keep]
+        self._sample_keys, self._sample_values = keys, sample
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float("nan")
+
+    def quantile(self, q: float) -> float:
+        if len(self._sample_values) == 0:
+            return float("nan")
+        return float(np.quantile(self._sample_values, q))
+
+    def outlier_bounds(self, mode: str = "sigma") -> tuple[float, float]:
+        """Sigma limits use the exact running mean/std; robust modes use the quantile sample."""
+        if mode == "sigma":
+            low, high = bounds_from_spread(np.array([self.mean]), np.array([self.std]), SIGMA_THRESHOLD)
+        else:
+            low, high = outlier_bounds(self._sample_values[:, None], mode)
+        return float(low[0]), float(high[0])
+
+    def describe(self) -> dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0.0, "mean": None, "std": None, "min": None, "25%": None, "50%": None, "75%": None, "max": None}
+        stats = {
+            "count": float(self.count),
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "25%": self.quantile(0.25),
+            "50%": self.quantile(0.5),
+            "75%": self.quantile(0.75),
+            "max": self.max,
+        }
+        return {k: _serialize_value(v) for k, v in stats.items()}
+
+
+class StreamingAnalysis:
+    """Chunked counterpart of AnalysisContext whose memory use is bounded by the chunk size.
+
+    Statistics are merged from per-chunk partial aggregates in a first pass; outlier
+    counts need the global mean/std and take a second pass over the numeric columns.
+    Quantiles in ``basic_stats`` come from a uniform sample and are approximate once a
+    column has more than ``QUANTILE_SAMPLE_SIZE`` non-null values. Duplicate rows and
+    primary keys are counted from 64-bit row digests, exactly by default or with a
+    HyperLogLog sketch when ``approximate_duplicates`` is set. The MAD/IQR outlier
+    modes take their limits from the same sample.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        chunksize: int = 100_000,
+        approximate_duplicates: bool = False,
+        hll_precision: int = 14,
+        outlier_mode: str = "sigma",
+    ):
+        self.file_path = file_path
+        self.chunksize = chunksize
+        self.approximate_duplicates = approximate_duplicates
+        self.hll_precision = hll_precision
+        self.outlier_mode = outlier_mode
+
+    def iter_chunks(self, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+        yield from iter_frames(self.file_path, self.chunksize, columns=columns)
+
+    @cached_property
+    def _first_pass(self) -> dict[str, Any]:
+        rng = np.random.default_rng(0)
+        columns: list[str] | None = None
+        rows = 0
+        dtypes: dict[str, np.dtype] = {}
+        null_counts: dict[str, int] = {}
+        numeric: dict[str, NumericAccumulator] = {}
+        long_strings: dict[str, int] = {}
+        row_duplicates = DuplicateCounter(self.approximate_duplicates, self.hll_precision)
+        pk_duplicates = DuplicateCounter(self.approximate_duplicates, self.hll_precision)
+        pk_column: str | None = None
+
+        for chunk in self.iter_chunks():
+            if columns is None:
+                columns = chunk.columns.tolist()
+                pk_column = next((c for c in columns if c.lower() in PK_CANDIDATES), None)
+                null_counts = {col: 0 for col in columns}
+            rows += len(chunk)
+
+            for col, count in chunk.isna().sum().items():
+                null_counts[col] += int(count)
+
+            for col in columns:
+                series = chunk[col]
+                dtypes[col] = merge_dtype(dtypes.get(col), series.dtype)
+                if is_plain_numeric(series.dtype):
+                    acc = numeric.setdefault(col, NumericAccumulator(rng))
+                    acc.update(series.to_numpy(dtype="float64", na_value=np.nan))
+                elif is_text_dtype(series.dtype):
+                    long_strings[col] = long_strings.get(col, 0) + count_long_strings(series)
+
+            row_duplicates.add(hash_rows(chunk))
+            if pk_column is not None:
+                pk_duplicates.add(hash_rows(chunk[[pk_column]]))
+
+        if columns is None:
+            columns = read_columns(self.file_path)
+
+        return {
+            "columns": columns,
+            "rows": rows,
+            "dtypes": dtypes,
+            "null_counts": null_counts,
+            "numeric": numeric,
+            "long_strings": long_strings,
+            "row_duplicates": row_duplicates,
+            "pk_column": pk_column,
+            "pk_duplicates": pk_duplicates,
+        }
+
+    @cached_property
+    def rows(self) -> int:
+        return self._first_pass["rows"]
+
+    @cached_property
+    def columns(self) -> list[str]:
+        return self._first_pass["columns"]
+
+    @cached_property
+    def dtypes(self) -> dict[str, str]:
+        merged = self._first_pass["dtypes"]
+        return {col: str(merged.get(col, np.dtype("object"))) for col in self.columns}
+
+    @cached_property
+    def null_counts(self) -> dict[str, int]:
+        return self._first_pass["null_counts"]
+
+    @cached_property
+    def null_pct(self) -> dict[str, float]:
+        if self.rows == 0:
+            return {col: float("nan") for col in self.columns}
+        return {col: count / self.rows for col, count in self.null_counts.items()}
+
+    @cached_property
+    def duplicate_rows(self) -> int:
+        return self._first_pass["row_duplicates"].duplicates
+
+    @cached_property
+    def duplicate_detection(self) -> dict:
+        return self._first_pass["row_duplicates"].detection
+
+    @cached_property
+    def numeric_columns(self) -> list[str]:
+        merged = self._first_pass["dtypes"]
+        return [col for col in self.columns if col in merged and is_plain_numeric(merged[col])]
+
+    @cached_property
+    def string_columns(self) -> list[str]:
+        merged = self._first_pass["dtypes"]
+        return [col for col in self.columns if is_text_dtype(merged.get(col, np.dtype("object")))]
+
+    @cached_property
+    def means(self) -> pd.Series:
+        numeric = self._first_pass["numeric"]
+        return pd.Series(
+            {col: numeric[col].mean if numeric[col].count else np.nan for col in self.numeric_columns},
+            dtype="float64",
+        )
+
+    @cached_property
+    def stds(self) -> pd.Series:
+        numeric = self._first_pass["numeric"]
+        return pd.Series({col: numeric[col].std for col in self.numeric_columns}, dtype="float64")
+
+    @cached_property
+    def basic_stats(self) -> dict[str, dict[str, Any]]:
+        numeric = self._first_pass["numeric"]
+        return {col: numeric[col].describe() for col in self.numeric_columns}
+
+    @cached_property
+    def pk_column(self) -> str | None:
+        return self._first_pass["pk_column"]
+
+    @cached_property
+    def pk_null_count(self) -> int:
+        if self.pk_column is None:
+            return 0
+        return self.null_counts[self.pk_column]
+
+    @cached_property
+    def pk_duplicate_count(self) -> int:
+        if self.pk_column is None:
+            return 0
+        return self._first_pass["pk_duplicates"].duplicates
+
+    @cached_property
+    def pk_duplicate_detection(self) -> dict:
+        return self._first_pass["pk_duplicates"].detection
+
+    @cached_property
+    def outlier_counts(self) -> dict[str, int]:
+        numeric = self._first_pass["numeric"]
+        bounds = {col: numeric[col].outlier_bounds(self.outlier_mode) for col in self.numeric_columns}
+        bounds = {col: limits for col, limits in bounds.items() if not np.isnan(limits[0])}
+        counts = {col: 0 for col in bounds}
+        if not bounds:
+            return counts
+        columns = list(bounds)
+        low = np.array([bounds[col][0] for col in columns])
+        high = np.array([bounds[col][1] for col in columns])
+        for chunk in self.iter_chunks(columns=columns):
+            chunk_counts = count_outliers(numeric_matrix(chunk, columns), low, high)
+            for col, count in zip(columns, chunk_counts):
+                counts[col] += int(count)
+        return counts
+
+    @cached_property
+    def long_string_counts(self) -> dict[str, int]:
+        long_strings = self._first_pass["long_strings"]
+        return {col: long_strings.get(col, 0) for col in self.string_columns}
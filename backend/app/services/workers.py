@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when the analysis pool already holds its maximum number of jobs."""
+
+
+class AnalysisPool:
+    """Size-limited process pool for CPU-bound analysis with admission control.
+
+    At most ``max_pending`` jobs (running plus queued) are admitted; further
+    submissions raise ``PoolSaturated`` immediately instead of queueing, so request
+    threads never pile up behind a long analysis. Workers are spawned rather than
+    forked so they do not inherit the API's sockets, database pool or event loop.
+    With ``max_workers <= 0`` jobs run inline in the calling thread.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers, 1)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _release(self, _future: Future | None = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                raise PoolSaturated("Analysis workers are busy")
+            self._in_flight += 1
+
+        if self.max_workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            finally:
+                self._release()
+            return future
+
+        try:
+            with self._lock:
+                executor = self._get_executor()
+            future = executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self._discard_executor()
+            self._release()
+            raise
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        try:
+            return self.submit(fn, *args, **kwargs).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool for the next job.
+            self._discard_executor()
+            raise
+
+    async def result_async(self, future: Future) -> Any:
+        """Await a submitted job without holding a thread; the async counterpart of ``run``."""
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._discard_executor()
+            raise
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.max_workers <= 0:
+            # Inline jobs would run on the event loop.
+            return await asyncio.to_thread(self.run, fn, *args, **kwargs)
+        return await self.result_async(self.submit(fn, *args, **kwargs))
+
+    def _discard_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: AnalysisPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_pool() -> AnalysisPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AnalysisPool(settings.analysis_workers, settings.analysis_max_pending)
+        return _pool
+
+
+def shutdown_analysis_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
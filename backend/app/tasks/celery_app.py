@@ -1,6 +1,12 @@
 from celery import Celery
+import os
+
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
+from prometheus_client import multiprocess
 
 from app.core.config import get_settings
+from app.services.http_client import close_http_client, reset_http_clients
+from app.services.metrics import start_metrics_server
 
 settings = get_settings()
 
@@ -21,3 +27,23 @@ celery.conf.update(
     enable_utc=True,
     broker_connection_retry_on_startup=True,
 )
+
+
+@worker_init.connect
+def init_worker(**kwargs):
+    # Prefork children only report through PROMETHEUS_MULTIPROC_DIR, which this
+    # server (in the parent process) aggregates.
+    if settings.celery_metrics_port:
+        start_metrics_server(settings.celery_metrics_port)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    reset_http_clients()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    close_http_client()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
@@ -3,14 +3,29 @@ from datetime import datetime, timezone
 from app.db.session import SessionLocal
 from app.models.cleaning_job import CleaningJob
 from app.models.dataset import Dataset
-from app.models.validation_result import ValidationResult
 from app.core.config import get_settings
-from app.services.cleaning import apply_cleaning_plan
-from app.services.llm import generate_cleaning_plan
-from app.services.processing import run_validation
+from app.services.llm import generate_cleaning_plan, summarize_and_plan
+from app.services.metrics import StageRecorder, timed_stage
+from app.services.processing import clean_and_revalidate, prepare_dataset, run_validation
+from app.services.results import find_reusable_result, record_validation_result, reuse_validation_result
 from app.tasks.celery_app import celery
 
 
+@celery.task(name="prepare_dataset")
+def prepare_dataset_task(dataset_id: str) -> str:
+    """Build the per-upload artifacts the upload request had no pool capacity for."""
+    db = SessionLocal()
+    try:
+        dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+        if not dataset:
+            return "not_found"
+        dataset.columnar_path = prepare_dataset(dataset.file_path) or dataset.columnar_path
+        db.commit()
+        return "ok"
+    finally:
+        db.close()
+
+
 @celery.task(name="process_dataset")
 def process_dataset_task(dataset_id: str) -> str:
     db = SessionLocal()
@@ -21,23 +36,47 @@ def process_dataset_task(dataset_id: str) -> str:
             return "not_found"
 
         dataset.status = "processing"
+        dataset.columnar_path = prepare_dataset(dataset.file_path) or dataset.columnar_path
         db.commit()
 
-        profile, issues, score, llm_summary, cleaning_plan = run_validation(
-            dataset.file_path,
-            use_llm=True,
-        )
-        result = ValidationResult(
-            dataset_id=dataset.id,
-            quality_score=score,
-            issues_json=issues,
-            profile_json=profile,
-            llm_summary=llm_summary,
-            cleaning_plan_json=cleaning_plan,
-        )
-        db.add(result)
+        existing = find_reusable_result(db, dataset.content_hash)
+        if existing and existing.llm_summary:
+            reuse_validation_result(db, dataset, existing)
+        elif existing:
+            recorder = StageRecorder()
+            with recorder.stage("llm"):
+                llm_summary, cleaning_plan = summarize_and_plan(existing.issues_json)
+            metrics = recorder.as_dict()
+            record_validation_result(
+                db,
+                dataset,
+                existing.profile_json,
+                existing.issues_json,
+                existing.quality_score,
+                llm_summary,
+                cleaning_plan,
+                content_hash=dataset.content_hash,
+                metrics=metrics,
+            )
+        else:
+            profile, issues, score, llm_summary, cleaning_plan, metrics = run_validation(
+                dataset.analysis_path,
+                use_llm=True,
+            )
+            record_validation_result(
+                db,
+                dataset,
+                profile,
+                issues,
+                score,
+                llm_summary,
+                cleaning_plan,
+                content_hash=dataset.content_hash,
+                metrics=metrics,
+            )
         dataset.status = "done"
-        db.commit()
+        with timed_stage("db_write"):
+            db.commit()
         return "ok"
     except Exception:
         if dataset:
@@ -68,23 +107,27 @@ def clean_dataset_task(job_id: str) -> str:
         dataset.status = "processing"
         db.commit()
 
-        result = (
-            db.query(ValidationResult)
-            .filter(ValidationResult.dataset_id == dataset.id)
-            .order_by(ValidationResult.created_at.desc())
-            .first()
-        )
+        result = dataset.latest_result
         if not result:
-            profile, issues, score, llm_summary, cleaning_plan = run_validation(dataset.file_path, use_llm=False)
-            result = ValidationResult(
-                dataset_id=dataset.id,
-                quality_score=score,
-                issues_json=issues,
-                profile_json=profile,
-                llm_summary=llm_summary,
-                cleaning_plan_json=cleaning_plan,
-            )
-            db.add(result)
+            existing = find_reusable_result(db, dataset.content_hash)
+            if existing:
+                result = reuse_validation_result(db, dataset, existing)
+            else:
+                profile, issues, score, llm_summary, cleaning_plan, metrics = run_validation(
+                    dataset.analysis_path,
+                    use_llm=False,
+                )
+                result = record_validation_result(
+                    db,
+                    dataset,
+                    profile,
+                    issues,
+                    score,
+                    llm_summary,
+                    cleaning_plan,
+                    content_hash=dataset.content_hash,
+                    metrics=metrics,
+                )
             db.commit()
             db.refresh(result)
 
@@ -93,31 +136,23 @@ def clean_dataset_task(job_id: str) -> str:
             db.commit()
 
         settings = get_settings()
-        cleaned_path = apply_cleaning_plan(
-            dataset.file_path,
+        # The source report only describes the cleaned input if it was computed for this content.
+        describes_source = bool(result.content_hash) and result.content_hash == dataset.content_hash
+        cleaned_path, profile, issues, score, metrics = clean_and_revalidate(
+            dataset.analysis_path,
             result.cleaning_plan_json,
             settings.cleaned_dir,
+            result.profile_json if describes_source else None,
+            result.issues_json if describes_source else None,
         )
         job.cleaned_file_path = cleaned_path
         job.status = "done"
         job.completed_at = datetime.now(timezone.utc)
-        db.commit()
-
-        profile, issues, score, llm_summary, cleaning_plan = run_validation(
-            cleaned_path,
-            use_llm=False,
-        )
-        cleaned_result = ValidationResult(
-            dataset_id=dataset.id,
-            quality_score=score,
-            issues_json=issues,
-            profile_json=profile,
-            llm_summary=llm_summary,
-            cleaning_plan_json=cleaning_plan,
-        )
-        db.add(cleaned_result)
+        job.metrics_json = metrics
+        record_validation_result(db, dataset, profile, issues, score, metrics=metrics)
         dataset.status = "done"
-        db.commit()
+        with timed_stage("db_write"):
+            db.commit()
         return "ok"
     except Exception:
         if dataset:
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import uuid
 from fastapi import UploadFile
@@ -7,17 +8,30 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def save_upload_file(upload_dir: str, upload_file: UploadFile) -> str:
+def save_upload_file(upload_dir: str, upload_file: UploadFile) -> tuple[str, str]:
+    """Store an upload under its SHA-256 digest and return ``(file_path, content_hash)``.
+
+    Identical content maps to the same file, so a repeated upload reuses the stored
+    copy (and any artifacts derived from it) instead of writing a new one.
+    """
     ensure_dir(upload_dir)
-    ext = os.path.splitext(upload_file.filename or "")[1]
-    file_name = f"{uuid.uuid4().hex}{ext}"
-    file_path = os.path.join(upload_dir, file_name)
+    ext = os.path.splitext(upload_file.filename or "")[1].lower()
+    tmp_path = os.path.join(upload_dir, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
 
-    with open(file_path, "wb") as out_file:
+    with open(tmp_path, "wb") as out_file:
         while True:
             chunk = upload_file.file.read(1024 * 1024)
             if not chunk:
                 break
+            digest.update(chunk)
             out_file.write(chunk)
 
-    return file_path
+    content_hash = digest.hexdigest()
+    file_path = os.path.join(upload_dir, f"{content_hash}{ext}")
+    if os.path.exists(file_path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, file_path)
+
+    return file_path, content_hash
@@ -0,0 +1,144 @@
+"""Synthetic dataset generator for the benchmarks.
+
+Usage (from backend/):
+    python -m benchmarks.generate --rows 1000000 --numeric 12 --strings 6 --out /tmp/bench.csv
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.analysis import LONG_STRING_CHARS
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    rows: int = 100_000
+    numeric_columns: int = 8
+    string_columns: int = 4
+    datetime_columns: int = 1
+    null_rate: float = 0.05
+    duplicate_rate: float = 0.02
+    outlier_rate: float = 0.001
+    long_string_rate: float = 0.001
+    primary_key: bool = True
+    seed: int = 0
+
+    def label(self) -> str:
+        return (
+            f"{self.rows}r-{self.numeric_columns}n{self.string_columns}s{self.datetime_columns}d"
+            f"-null{self.null_rate:g}-dup{self.duplicate_rate:g}-out{self.outlier_rate:g}-seed{self.seed}"
+        )
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+_WORDS = np.array(["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"])
+
+
+def _with_nulls(values: np.ndarray, rng: np.random.Generator, rate: float) -> np.ndarray:
+    if rate <= 0:
+        return values
+    mask = rng.random(len(values)) < rate
+    if not mask.any():
+        return values
+    values = values.astype(object) if values.dtype.kind in "iUO" else values.copy()
+    values[mask] = None if values.dtype == object else np.nan
+    return values
+
+
+def generate_frame(spec: DatasetSpec) -> pd.DataFrame:
+    """Build the frame for ``spec``; the same spec always yields the same data."""
+    rng = np.random.default_rng(spec.seed)
+    unique_rows = max(1, int(round(spec.rows * (1 - spec.duplicate_rate))))
+    columns: dict[str, np.ndarray] = {}
+
+    if spec.primary_key:
+        columns["id"] = np.arange(unique_rows, dtype=np.int64)
+
+    for i in range(spec.numeric_columns):
+        values = rng.normal(loc=100.0 * (i + 1), scale=10.0 * (i + 1), size=unique_rows)
+        outliers = rng.random(unique_rows) < spec.outlier_rate
+        values[outliers] += rng.choice([-1, 1], outliers.sum()) * 20.0 * (i + 1) * 10
+        if i % 2:
+            values = np.round(values)
+        columns[f"num_{i}"] = _with_nulls(values, rng, spec.null_rate)
+
+    for i in range(spec.string_columns):
+        values = _WORDS[rng.integers(0, len(_WORDS), unique_rows)].astype(object)
+        values = values + "_" + rng.integers(0, 1000, unique_rows).astype(str).astype(object)
+        long = rng.random(unique_rows) < spec.long_string_rate
+        values[long] = "x" * (LONG_STRING_CHARS + 45)
+        columns[f"str_{i}"] = _with_nulls(values, rng, spec.null_rate)
+
+    start = np.datetime64("2020-01-01T00:00:00")
+    for i in range(spec.datetime_columns):
+        offsets = rng.integers(0, 5 * 365 * 24 * 3600, unique_rows).astype("timedelta64[s]")
+        columns[f"ts_{i}"] = (start + offsets).astype("datetime64[s]").astype(str)
+
+    frame = pd.DataFrame(columns)
+    extra = spec.rows - unique_rows
+    if extra > 0:
+        # Exact copies of existing rows (primary key included) make the duplicate rate deterministic.
+        frame = pd.concat([frame, frame.iloc[rng.integers(0, unique_rows, extra)]], ignore_index=True)
+        frame = frame.iloc[rng.permutation(len(frame))].reset_index(drop=True)
+    return frame
+
+
+def write_dataset(spec: DatasetSpec, path: str) -> str:
+    """Write the dataset for ``spec`` to ``path`` as CSV or Parquet, by extension."""
+    frame = generate_frame(spec)
+    tmp_path = f"{path}.tmp"
+    if path.endswith(".parquet"):
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--numeric", type=int, default=defaults.numeric_columns)
+    parser.add_argument("--strings", type=int, default=defaults.string_columns)
+    parser.add_argument("--datetimes", type=int, default=defaults.datetime_columns)
+    parser.add_argument("--null-rate", type=float, default=defaults.null_rate)
+    parser.add_argument("--duplicate-rate", type=float, default=defaults.duplicate_rate)
+    parser.add_argument("--outlier-rate", type=float, default=defaults.outlier_rate)
+    parser.add_argument("--long-string-rate", type=float, default=defaults.long_string_rate)
+    parser.add_argument("--no-primary-key", action="store_true")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    return DatasetSpec(
+        rows=args.rows,
+        numeric_columns=args.numeric,
+        string_columns=args.strings,
+        datetime_columns=args.datetimes,
+        null_rate=args.null_rate,
+        duplicate_rate=args.duplicate_rate,
+        outlier_rate=args.outlier_rate,
+        long_string_rate=args.long_string_rate,
+        primary_key=not args.no_primary_key,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset for benchmarks")
+    add_spec_arguments(parser)
+    parser.add_argument("--out", required=True, help="Output path (.csv or .parquet)")
+    args = parser.parse_args()
+    path = write_dataset(spec_from_args(args), args.out)
+    print(f"{path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Benchmark harness for the analysis services and the upload-to-report path.
+
+Usage (from backend/):
+    python -m benchmarks.run --rows 200000 --repeat 3 --out bench.json
+    python -m benchmarks.run --rows 200000 --compare bench.json
+    python -m benchmarks.run --cases e2e   # needs DATABASE_URL pointing at a migrated database
+
+Every repeat runs in a fresh spawned process, so peak RSS and in-process caches do
+not leak between cases. Datasets are generated deterministically from the spec and
+cached under --data-dir, which keeps results comparable across commits.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from benchmarks.generate import DatasetSpec, add_spec_arguments, spec_from_args, write_dataset
+
+CLEANING_PLAN = {
+    "steps": [
+        {"action": "fill_nulls"},
+        {"action": "drop_duplicates"},
+        {"action": "remove_outliers"},
+    ]
+}
+
+
+def _case_profile(path: str) -> None:
+    from app.services.profiling import profile_dataset
+
+    profile_dataset(path)
+
+
+def _case_validate(path: str) -> None:
+    from app.services.validation import validate_dataset
+
+    validate_dataset(path)
+
+
+def _case_run_validation(path: str) -> None:
+    from app.services.processing import run_validation
+
+    run_validation(path)
+
+
+def _case_clean(path: str) -> None:
+    from app.services.cleaning import apply_cleaning_plan
+
+    with tempfile.TemporaryDirectory() as cleaned_dir:
+        apply_cleaning_plan(path, CLEANING_PLAN, cleaned_dir)
+
+
+def _case_e2e(path: str) -> None:
+    """Upload with synchronous processing, read the report, explain it and clean it."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    password = uuid.uuid4().hex
+    client.post("/auth/register", json={"email": email, "password": password}).raise_for_status()
+    token = client.post("/auth/login", data={"username": email, "password": password}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with open(path, "rb") as handle:
+        upload = client.post(
+            "/datasets/upload",
+            files={"file": (os.path.basename(path), handle)},
+            headers=headers,
+        )
+    upload.raise_for_status()
+    dataset_id = upload.json()["id"]
+    client.get(f"/datasets/{dataset_id}/report", headers=headers).raise_for_status()
+    client.post(f"/datasets/{dataset_id}/explain", headers=headers).raise_for_status()
+    client.post(f"/datasets/{dataset_id}/clean", headers=headers).raise_for_status()
+
+
+CASES: dict[str, Callable[[str], None]] = {
+    "profile": _case_profile,
+    "validate": _case_validate,
+    "run_validation": _case_run_validation,
+    "clean": _case_clean,
+    "e2e": _case_e2e,
+}
+DEFAULT_CASES = ["profile", "validate", "run_validation", "clean"]
+
+# Imported before a case's timer starts, so stages measure the work rather than module
+# import time (app.services.processing alone pulls in the LLM, HTTP and Redis clients).
+CASE_IMPORTS: dict[str, list[str]] = {
+    "profile": ["app.services.profiling"],
+    "validate": ["app.services.validation"],
+    "run_validation": ["app.services.processing"],
+    "clean": ["app.services.cleaning"],
+    "e2e": ["fastapi.testclient", "app.main"],
+}
+
+
+def _measure(case: str, path: str, rows: int, env: dict[str, str]) -> dict[str, Any]:
+    # Runs in a fresh spawned process; settings are read from the environment on import.
+    os.environ.update(env)
+    from app.services.metrics import StageRecorder
+
+    for module in CASE_IMPORTS[case]:
+        importlib.import_module(module)
+    recorder = StageRecorder()
+    with recorder.stage(case, rows=rows, bytes=os.path.getsize(path)):
+        CASES[case](path)
+    return recorder.stages[case]
+
+
+def _summarize(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    wall_ms = statistics.median(run["wall_ms"] for run in runs)
+    rows = runs[0]["rows"] or 0
+    size = runs[0]["bytes"] or 0
+    seconds = wall_ms / 1000
+    return {
+        "runs": runs,
+        "median_wall_ms": round(wall_ms, 3),
+        "median_cpu_ms": round(statistics.median(run["cpu_ms"] for run in runs), 3),
+        "peak_rss_mb": round(max(run["peak_rss_bytes"] for run in runs) / 2**20, 1),
+        "rows_per_s": round(rows / seconds) if seconds else None,
+        "mb_per_s": round(size / 1e6 / seconds, 2) if seconds else None,
+    }
+
+
+def _environment() -> dict[str, Any]:
+    import numpy
+    import pandas
+    import pyarrow
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _print_table(results: dict[str, dict], baseline: dict[str, dict] | None) -> None:
+    header = f"{'case':<16}{'wall ms':>12}{'rows/s':>14}{'MB/s':>10}{'peak MB':>10}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    for case, result in results.items():
+        line = (
+            f"{case:<16}{result['median_wall_ms']:>12.1f}{result['rows_per_s'] or 0:>14,}"
+            f"{result['mb_per_s'] or 0:>10.2f}{result['peak_rss_mb']:>10.1f}"
+        )
+        if baseline and case in baseline:
+            ratio = result["median_wall_ms"] / baseline[case]["median_wall_ms"]
+            line += f"{ratio:>9.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the data quality benchmarks")
+    add_spec_arguments(parser)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=DEFAULT_CASES)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--stream", action="store_true", help="Force the chunked (streaming) code paths")
+    parser.add_argument("--infer-dtypes", action="store_true", help="Read the dataset with its inferred column schema")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "dq-bench"))
+    parser.add_argument("--out", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON results to compare median wall time against")
+    args = parser.parse_args()
+
+    spec: DatasetSpec = spec_from_args(args)
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = os.path.join(args.data_dir, f"{spec.label()}.{args.format}")
+    if not os.path.exists(path):
+        write_dataset(spec, path)
+    # The schema sidecar sits next to the cached dataset; drop it when not asked for.
+    from app.core.config import get_settings
+    from app.services.ingestion import ensure_schema
+    from app.services.schema import schema_path_for
+
+    if args.infer_dtypes:
+        ensure_schema(path, get_settings().dtype_sample_rows)
+    elif os.path.exists(schema_path_for(path)):
+        os.remove(schema_path_for(path))
+
+    # The LLM is stubbed by running without an API key, which selects the rule-based fallback.
+    env = {"GEMINI_API_KEY": "", "LLM_CACHE_ENABLED": "false"}
+    if args.stream:
+        env["STREAM_THRESHOLD_MB"] = "0"
+
+    results: dict[str, dict] = {}
+    context = multiprocessing.get_context("spawn")
+    for case in args.cases:
+        runs = []
+        for _ in range(args.repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs.append(executor.submit(_measure, case, path, spec.rows, env).result())
+        results[case] = _summarize(runs)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)["results"]
+    _print_table(results, baseline)
+
+    if args.out:
+        report = {
+            "environment": _environment(),
+            "dataset": {**spec.as_dict(), "format": args.format, "bytes": os.path.getsize(path)},
+            "options": {"stream": args.stream, "infer_dtypes": args.infer_dtypes, "repeat": args.repeat},
+            "results": results,
+        }
+        with open(args.out, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
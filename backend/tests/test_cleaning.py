@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import cleaning
+from app.services.cleaning import (
+    CleaningDelta,
+    ConvertType,
+    DropDuplicates,
+    FillNulls,
+    FilterOutliers,
+    _clean_in_chunks,
+    clean_file,
+    compile_cleaning_plan,
+    execute_cleaning_ops,
+)
+
+COLUMNS = ["id", "value", "label"]
+
+
+def _plan(*actions, details=""):
+    return {"steps": [{"action": action, "details": details} for action in actions]}
+
+
+def _dirty_frame(seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": rng.integers(0, 60, 400),
+        "value": rng.normal(10, 2, 400),
+        "label": rng.choice(["a", "b"], 400),
+    })
+    df.loc[rng.choice(400, 40, replace=False), "value"] = np.nan
+    df.loc[rng.choice(400, 5, replace=False), "value"] = 500.0
+    # Copies of earlier rows, some of them only equal once nulls are filled.
+    return pd.concat([df, df.iloc[:80]], ignore_index=True)
+
+
+def _assert_same_rows(got: pd.DataFrame, expected: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        got.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_compile_keeps_order_and_drops_unknown_steps():
+    plan = {"steps": [
+        {"action": "Fill nulls"},
+        {"action": "rename columns"},
+        "not a step",
+        {"action": "Drop duplicates"},
+        {"action": "Remove outliers"},
+        {"action": "Convert type", "details": "column: VALUE, type: float"},
+        {"action": "convert type", "details": "column: missing, type: int"},
+    ]}
+    ops = compile_cleaning_plan(plan, COLUMNS, outlier_mode="iqr")
+    assert ops == [FillNulls(), DropDuplicates(), FilterOutliers("iqr"), ConvertType("value", "float64")]
+
+
+def test_compile_collapses_consecutive_idempotent_steps_only():
+    plan = _plan("fill nulls", "fill nulls", "drop duplicates", "drop duplicates",
+                 "remove outliers", "remove outliers", "drop duplicates")
+    ops = compile_cleaning_plan(plan, COLUMNS)
+    assert ops == [FillNulls(), DropDuplicates(), FilterOutliers(), FilterOutliers(), DropDuplicates()]
+
+
+@pytest.mark.parametrize("plan", [None, {}, {"steps": "drop duplicates"}])
+def test_compile_ignores_malformed_plans(plan):
+    assert compile_cleaning_plan(plan, COLUMNS) == []
+
+
+def test_drop_duplicates_matches_pandas():
+    df = _dirty_frame()
+    got = execute_cleaning_ops(df.copy(), [DropDuplicates()])
+    _assert_same_rows(got, df[~df.duplicated()])
+
+
+@pytest.mark.parametrize(
+    "ops",
+    [
+        [FillNulls(), DropDuplicates(), FilterOutliers()],
+        [DropDuplicates(), FillNulls(), DropDuplicates(), FilterOutliers("iqr")],
+        [FilterOutliers("mad"), FillNulls(), DropDuplicates()],
+        [ConvertType("id", "float64"), FillNulls(), FilterOutliers(), DropDuplicates()],
+    ],
+)
+def test_fused_ops_match_applying_each_step_in_order(ops):
+    df = _dirty_frame()
+    expected = df.copy()
+    for op in ops:
+        expected = execute_cleaning_ops(expected.reset_index(drop=True).copy(), [op])
+    _assert_same_rows(execute_cleaning_ops(df.copy(), ops), expected)
+
+
+def test_fill_dedupe_outliers_plan_cleans_file(tmp_path):
+    values = [10.0, 11.0, 9.0, 10.5, 9.5] * 4 + [1000.0]
+    df = pd.DataFrame({"id": range(len(values)), "value": values})
+    df.loc[3, "value"] = np.nan
+    df = pd.concat([df, df.iloc[[0, 1]]], ignore_index=True)
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+
+    outcome = clean_file(str(path), _plan("fill nulls", "drop duplicates", "remove outliers"), str(tmp_path / "out"))
+
+    cleaned = pd.read_csv(outcome.path)
+    assert cleaned["id"].tolist() == [i for i in range(20)]
+    assert cleaned["value"].notna().all()
+    assert cleaned.loc[3, "value"] == np.median([v for i, v in enumerate(values[:21]) if i != 3])
+    assert outcome.delta == CleaningDelta(
+        rows_before=23, rows_removed=3, changed_columns={"value"}, duplicates_resolved=True
+    )
+
+
+def _write(tmp_path, df: pd.DataFrame) -> str:
+    path = tmp_path / "expected.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _clean_chunked(tmp_path, df: pd.DataFrame, ops, chunksize: int) -> pd.DataFrame:
+    source = tmp_path / "source.csv"
+    cleaned = tmp_path / "cleaned.csv"
+    df.to_csv(source, index=False)
+    _clean_in_chunks(str(source), ops, str(cleaned), chunksize)
+    return pd.read_csv(cleaned)
+
+
+@pytest.mark.parametrize("chunksize", [1, 13, 1000])
+def test_chunked_dedupe_matches_in_memory(tmp_path, chunksize):
+    df = _dirty_frame()
+    expected = pd.read_csv(_write(tmp_path, df)).drop_duplicates()
+    _assert_same_rows(_clean_chunked(tmp_path, df, [DropDuplicates()], chunksize), expected)
+
+
+def test_chunked_repeated_dedupe_keeps_first_occurrences(tmp_path):
+    df = _dirty_frame()
+    expected = pd.read_csv(_write(tmp_path, df)).drop_duplicates()
+    got = _clean_chunked(tmp_path, df, [DropDuplicates(), DropDuplicates()], chunksize=50)
+    _assert_same_rows(got, expected)
+
+
+def test_chunked_dedupe_keeps_integers_beyond_float_precision(tmp_path):
+    df = pd.DataFrame({"a": [2 ** 53, 2 ** 53 + 1, 2 ** 53, 2 ** 53 + 1, 7]})
+    got = _clean_chunked(tmp_path, df, [DropDuplicates()], chunksize=2)
+    assert got["a"].tolist() == [2 ** 53, 2 ** 53 + 1, 7]
+
+
+def test_chunked_dedupe_never_drops_rows_on_digest_collisions(tmp_path, monkeypatch):
+    monkeypatch.setattr(cleaning, "hash_rows", lambda chunk: np.zeros(len(chunk), dtype=np.uint64))
+    df = pd.DataFrame({"a": [1, 2, 1, 3, 4, 1], "b": ["x", "y", "x", "z", "w", "x"]})
+    got = _clean_chunked(tmp_path, df, [DropDuplicates()], chunksize=2)
+    assert got["a"].tolist() == [1, 2, 3, 4]
@@ -0,0 +1,22 @@
+from app.services import llm
+
+
+def test_cleaning_plan_is_cached_only_when_it_parses(monkeypatch):
+    stored = {}
+    monkeypatch.setattr(llm, "_cache_set", stored.__setitem__)
+
+    malformed = llm._finish_cleaning_plan([], "bad", "Sure! Here is the plan: drop duplicates")
+    assert malformed == {"raw": "Sure! Here is the plan: drop duplicates", "source": "llm"}
+    assert stored == {}
+
+    plan = llm._finish_cleaning_plan([], "good", '{"steps": [{"action": "drop duplicates", "details": ""}]}')
+    assert stored == {"good": plan}
+
+
+def test_missing_response_falls_back_without_caching(monkeypatch):
+    stored = {}
+    monkeypatch.setattr(llm, "_cache_set", stored.__setitem__)
+    issues = [{"type": "duplicate_rows", "count": 3, "message": "Dataset contains 3 duplicate rows"}]
+    assert llm._finish_cleaning_plan(issues, "key", None) == llm._fallback_cleaning_plan(issues)
+    assert llm._finish_summary(issues, "key", None) == llm._fallback_summary(issues)
+    assert stored == {}
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.outliers import (
+    IQR_FACTOR,
+    MAD_SCALE,
+    MAD_THRESHOLD,
+    SIGMA_THRESHOLD,
+    count_outliers,
+    inlier_rows,
+    numeric_matrix,
+    outlier_bounds,
+)
+
+
+def _frame() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame({
+        "normal": rng.normal(50, 5, 500),
+        "skewed": rng.exponential(3, 500),
+        "ints": rng.integers(0, 100, 500),
+    })
+    df.loc[[3, 70, 400], "normal"] = [500.0, -300.0, np.nan]
+    df.loc[[10, 11], "skewed"] = [np.nan, 90.0]
+    return df
+
+
+def _reference_bounds(series: pd.Series, mode: str) -> tuple[float, float]:
+    series = series.dropna()
+    if mode == "sigma":
+        center, width = series.mean(), SIGMA_THRESHOLD * series.std()
+        return center - width, center + width
+    if mode == "mad":
+        median = series.median()
+        width = MAD_THRESHOLD * MAD_SCALE * (series - median).abs().median()
+        return median - width, median + width
+    q1, q3 = series.quantile([0.25, 0.75])
+    return q1 - IQR_FACTOR * (q3 - q1), q3 + IQR_FACTOR * (q3 - q1)
+
+
+@pytest.mark.parametrize("mode", ["sigma", "mad", "iqr"])
+def test_bounds_and_counts_match_per_column_reference(mode):
+    df = _frame()
+    values = numeric_matrix(df, df.columns.tolist())
+    low, high = outlier_bounds(values, mode)
+    for i, col in enumerate(df.columns):
+        ref_low, ref_high = _reference_bounds(df[col], mode)
+        assert low[i] == pytest.approx(ref_low)
+        assert high[i] == pytest.approx(ref_high)
+        series = df[col].dropna()
+        assert count_outliers(values, low, high)[i] == ((series < ref_low) | (series > ref_high)).sum()
+
+
+@pytest.mark.parametrize("mode", ["sigma", "mad", "iqr"])
+def test_injected_outliers_are_flagged_and_nans_are_not(mode):
+    df = _frame()
+    values = numeric_matrix(df, ["normal"])
+    low, high = outlier_bounds(values, mode)
+    keep = inlier_rows(values, low, high)
+    assert not keep[3] and not keep[70]
+    assert keep[400]
+
+
+@pytest.mark.parametrize("mode", ["sigma", "mad", "iqr"])
+def test_constant_all_nan_and_single_value_columns_have_no_outliers(mode):
+    values = np.array([
+        [7.0, np.nan, np.nan, 1.0],
+        [7.0, np.nan, 4.0, 1.0],
+        [7.0, np.nan, np.nan, 1.0],
+        [7.0, np.nan, np.nan, 1.0],
+        [7.0, np.nan, np.nan, 1000.0],
+    ])
+    low, high = outlier_bounds(values, mode)
+    assert np.isnan(low[:3]).all() and np.isnan(high[:3]).all()
+    counts = count_outliers(values, low, high)
+    assert counts[:3].tolist() == [0, 0, 0]
+    if mode == "sigma":
+        # With ddof=1 a single extreme value among five stays within 3 sigma.
+        assert counts[3] == 0
+    else:
+        # The robust spread of the last column is zero, so it is treated as constant.
+        assert np.isnan(low[3])
+
+
+def test_empty_input_gives_nan_bounds():
+    low, high = outlier_bounds(np.empty((0, 2)), "mad")
+    assert low.shape == (2,) and np.isnan(low).all() and np.isnan(high).all()
+    assert inlier_rows(np.empty((0, 2)), low, high).shape == (0,)
+
+
+def test_nullable_integer_columns_are_read_as_floats():
+    df = pd.DataFrame({"a": pd.array([1, None, 3], dtype="Int64")})
+    values = numeric_matrix(df, ["a"])
+    assert values.dtype == np.float64 and np.isnan(values[1, 0])
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        outlier_bounds(np.ones((3, 1)), "zscore")
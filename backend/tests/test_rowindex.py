@@ -0,0 +1,160 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import rowindex
+from app.services.ingestion import read_row_range
+from app.services.rowindex import (
+    ROW_INDEX_STRIDE,
+    build_row_index,
+    ensure_row_index,
+    load_row_index,
+    save_row_index,
+)
+
+ROWS = 3000
+
+
+def _frame(rows: int = ROWS) -> pd.DataFrame:
+    text = np.array([f"plain {i}" for i in range(rows)], dtype=object)
+    # Quoted fields with embedded newlines and escaped quotes, clustered around the
+    # checkpoints so records span them.
+    for i in list(range(1018, 1030)) + list(range(2044, 2052)) + list(range(0, rows, 97)):
+        text[i] = f'line one {i}\nline "two"\r\nthree, with comma'
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "text": text,
+        "value": np.where(np.arange(rows) % 11 == 0, np.nan, np.arange(rows) * 0.5),
+    })
+
+
+def _assert_same_rows(got: pd.DataFrame, expected: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        got.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+        check_index_type=False,
+    )
+
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    path = tmp_path / "data.csv"
+    _frame().to_csv(path, index=False)
+    return str(path)
+
+
+def test_index_counts_rows_with_embedded_newlines(quoted_csv):
+    index = build_row_index(quoted_csv)
+    assert index.rows == ROWS
+    assert len(index.checkpoints) == -(-ROWS // ROW_INDEX_STRIDE)
+
+
+@pytest.mark.parametrize(
+    "start, stop",
+    [
+        (0, 0),
+        (0, 1),
+        (0, 50),
+        (1, 2),
+        (1023, 1024),
+        (1023, 1025),
+        (1024, 1025),
+        (1000, 1100),
+        (1024, 2048),
+        (2047, 2049),
+        (ROWS - 1, ROWS),
+        (ROWS - 5, ROWS + 10),
+        (ROWS, ROWS + 10),
+        (ROWS + 500, ROWS + 510),
+    ],
+)
+def test_read_row_range_matches_full_parse(quoted_csv, start, stop):
+    ensure_row_index(quoted_csv)
+    expected = pd.read_csv(quoted_csv).iloc[start:stop]
+    _assert_same_rows(read_row_range(quoted_csv, start, stop), expected)
+
+
+def test_small_stride_and_blocks_split_quoted_records(quoted_csv, monkeypatch):
+    # Tiny scan blocks force quoted fields to straddle block boundaries.
+    monkeypatch.setattr(rowindex, "_BLOCK_BYTES", 7)
+    index = build_row_index(quoted_csv, stride=5)
+    assert index.rows == ROWS
+    save_row_index(quoted_csv, index)
+    full = pd.read_csv(quoted_csv)
+    for start, stop in [(0, 3), (4, 6), (5, 5), (1017, 1031), (2043, 2053), (ROWS - 2, ROWS + 3)]:
+        _assert_same_rows(read_row_range(quoted_csv, start, stop), full.iloc[start:stop])
+
+
+def test_crlf_blank_lines_and_missing_trailing_newline(tmp_path):
+    path = tmp_path / "crlf.csv"
+    path.write_bytes(b'a,b\r\n1,"x\r\ny"\r\n\r\n2,z\r\n\r\n3,"q""uote"')
+    index = build_row_index(str(path))
+    assert index.rows == 3
+    save_row_index(str(path), index)
+    expected = pd.read_csv(path)
+    assert len(expected) == 3
+    for start, stop in [(0, 3), (1, 2), (2, 3), (2, 10)]:
+        _assert_same_rows(read_row_range(str(path), start, stop), expected.iloc[start:stop])
+
+
+def test_header_only_and_empty_files(tmp_path):
+    header_only = tmp_path / "header.csv"
+    header_only.write_text("a,b\n")
+    index = build_row_index(str(header_only))
+    assert index.rows == 0
+    save_row_index(str(header_only), index)
+    page = read_row_range(str(header_only), 0, 10)
+    assert list(page.columns) == ["a", "b"] and page.empty
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    assert build_row_index(str(empty)).rows == 0
+
+
+def test_index_is_ignored_once_the_file_changes(quoted_csv):
+    ensure_row_index(quoted_csv)
+    assert load_row_index(quoted_csv) is not None
+    with open(quoted_csv, "a") as handle:
+        handle.write("9999,extra,1.0\n")
+    assert load_row_index(quoted_csv) is None
+    assert ensure_row_index(quoted_csv).rows == ROWS + 1
+
+
+def test_read_row_range_without_index_falls_back_to_skipping_rows(quoted_csv):
+    assert load_row_index(quoted_csv) is None
+    expected = pd.read_csv(quoted_csv).iloc[1020:1030]
+    _assert_same_rows(read_row_range(quoted_csv, 1020, 1030), expected)
+
+
+def test_parquet_pages_span_row_groups(tmp_path):
+    path = tmp_path / "data.parquet"
+    df = _frame(2500)
+    df.to_parquet(path, index=False, row_group_size=700)
+    for start, stop in [(0, 10), (695, 705), (1399, 1401), (2490, 2600), (2600, 2700)]:
+        _assert_same_rows(read_row_range(str(path), start, stop), df.iloc[start:stop])
+    assert list(read_row_range(str(path), 0, 5, columns=["value"]).columns) == ["value"]
+
+
+def test_concurrent_index_writers_do_not_collide(quoted_csv):
+    index = build_row_index(quoted_csv)
+    errors = []
+
+    def write():
+        try:
+            for _ in range(20):
+                save_row_index(quoted_csv, index)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert load_row_index(quoted_csv).rows == ROWS
+    assert sorted(os.listdir(os.path.dirname(quoted_csv))) == ["data.csv", "data.rowidx.npz"]
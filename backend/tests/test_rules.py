@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import rules
+from app.services.analysis import AnalysisContext
+from app.services.rules import enabled_rules, register_rule, required_statistics, run_rules
+from app.services.validation import build_issues_with_timings
+
+
+class RecordingStats:
+    """DatasetStats stand-in that counts reads and fails on statistics it was not given."""
+
+    def __init__(self, **stats):
+        self._stats = stats
+        self.reads: dict[str, int] = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name not in self._stats:
+            raise AssertionError(f"statistic {name} was computed")
+        self.reads[name] = self.reads.get(name, 0) + 1
+        return self._stats[name]
+
+
+def _frame() -> pd.DataFrame:
+    df = pd.DataFrame({
+        "id": [1, 2, 2, 4, 5, 6, 7, 8, 9, 10],
+        "value": [1.0, 2.0, 2.0, np.nan, 1.5, 1.0, 2.0, 1.5, 1.0, 2.0],
+        "note": ["x", "y", "y", "z" * 300, "x", "y", "x", "y", "x", "y"],
+    })
+    return pd.concat([df, df.iloc[[0]]], ignore_index=True)
+
+
+def test_enabled_rules_keep_registration_order():
+    assert [rule.name for rule in enabled_rules()] == list(rules.RULES)
+    names = [rule.name for rule in enabled_rules(["string_length", "null_rate"])]
+    assert names == ["null_rate", "string_length"]
+
+
+def test_enabled_rules_reject_unknown_names():
+    with pytest.raises(ValueError, match="no_such_rule"):
+        enabled_rules(["null_rate", "no_such_rule"])
+
+
+def test_required_statistics_cover_only_enabled_rules():
+    assert required_statistics(enabled_rules(["duplicate_rows"])) == {"duplicate_rows", "duplicate_detection"}
+    assert required_statistics(enabled_rules([])) == set()
+
+
+def test_disabled_rules_neither_run_nor_compute_statistics():
+    ctx = RecordingStats(null_pct={"a": 0.5, "b": 0.0})
+    issues, timings = run_rules(ctx, enabled_rules(["null_rate"]))
+    assert [issue["type"] for issue in issues] == ["high_null_rate"]
+    assert list(timings) == ["null_rate"]
+
+
+def test_shared_statistics_are_requested_once_before_checks(monkeypatch):
+    monkeypatch.setattr(rules, "RULES", {})
+    register_rule("first", requires=("duplicate_rows", "duplicate_detection"))(lambda ctx: [])
+    register_rule("second", requires=("duplicate_detection",))(lambda ctx: [])
+    ctx = RecordingStats(duplicate_rows=0, duplicate_detection={"method": "exact"})
+    run_rules(ctx, enabled_rules())
+    assert ctx.reads == {"duplicate_rows": 1, "duplicate_detection": 1}
+
+
+def test_register_rule_rejects_unknown_statistics(monkeypatch):
+    monkeypatch.setattr(rules, "RULES", {})
+    with pytest.raises(ValueError, match="row_entropy"):
+        register_rule("entropy", requires=("rows", "row_entropy"))
+    assert rules.RULES == {}
+
+
+def test_registered_rule_runs_after_builtin_rules(monkeypatch):
+    monkeypatch.setattr(rules, "RULES", dict(rules.RULES))
+
+    @register_rule("wide_table", requires=("columns",))
+    def check_wide_table(ctx):
+        return [{"type": "wide_table", "count": len(ctx.columns)}] if len(ctx.columns) > 2 else []
+
+    issues, timings = run_rules(AnalysisContext(frame=_frame()), enabled_rules())
+    assert issues[-1] == {"type": "wide_table", "count": 3}
+    assert list(timings)[-1] == "wide_table"
+
+
+def test_rule_selection_filters_issues_and_timings():
+    ctx = AnalysisContext(frame=_frame())
+    all_issues, _, all_timings = build_issues_with_timings(ctx)
+    assert {"primary_key_duplicates", "duplicate_rows", "high_null_rate", "string_length"} <= {
+        issue["type"] for issue in all_issues
+    }
+    assert set(all_timings) == set(rules.RULES)
+
+    issues, _, timings = build_issues_with_timings(AnalysisContext(frame=_frame()), ["duplicate_rows"])
+    assert issues == [issue for issue in all_issues if issue["type"] == "duplicate_rows"]
+    assert issues[0]["count"] == _frame().duplicated().sum()
+    assert list(timings) == ["duplicate_rows"]
+
+
+def test_primary_key_issue_reports_its_own_detection():
+    ctx = RecordingStats(
+        pk_column="id",
+        pk_null_count=0,
+        pk_duplicate_count=4,
+        pk_duplicate_detection={"method": "approximate", "distinct_relative_error": 0.0081, "duplicates_error": 12},
+    )
+    issues, _ = run_rules(ctx, enabled_rules(["primary_key"]))
+    assert issues[0]["type"] == "primary_key_duplicates"
+    assert issues[0]["duplicates_error"] == 12
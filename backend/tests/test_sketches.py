@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.sketches import DuplicateCounter, HyperLogLog, RowHashSet, hash_rows
+from app.services.streaming import StreamingAnalysis
+
+
+def _frame_with_duplicates(rows: int = 5000, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "a": rng.integers(0, 40, rows),
+        "b": rng.choice(["x", "y", "z"], rows),
+        "c": rng.integers(0, 5, rows).astype("float64"),
+    })
+    # NaN in a few rows turns "c" into float only in the chunks that hold them.
+    df.loc[rng.choice(rows, 30, replace=False), "c"] = np.nan
+    return df
+
+
+def _chunks(df: pd.DataFrame, size: int):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 500, 5000])
+def test_exact_counter_matches_pandas_duplicated(chunksize):
+    df = _frame_with_duplicates()
+    counter = DuplicateCounter()
+    for chunk in _chunks(df, chunksize):
+        counter.add(hash_rows(chunk))
+    assert counter.total == len(df)
+    assert counter.duplicates == df.duplicated().sum()
+    assert counter.distinct == len(df) - df.duplicated().sum()
+    assert counter.detection == {"method": "exact"}
+
+
+def test_streaming_duplicates_match_pandas_across_parsed_chunks(tmp_path):
+    df = _frame_with_duplicates()
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    expected = pd.read_csv(path).duplicated().sum()
+    assert expected > 0
+    analysis = StreamingAnalysis(str(path), chunksize=333)
+    assert analysis.duplicate_rows == expected
+    assert analysis.duplicate_detection == {"method": "exact"}
+
+
+def test_hash_rows_ignores_int_float_parsing_differences():
+    as_int = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    as_float = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": ["x", "y", "z"]})
+    np.testing.assert_array_equal(hash_rows(as_int), hash_rows(as_float))
+
+
+def test_hash_rows_keeps_large_integers_distinct():
+    big = pd.DataFrame({"a": [2 ** 53, 2 ** 53 + 1]})
+    hashes = hash_rows(big)
+    assert hashes[0] != hashes[1]
+
+
+def test_row_hash_set_reports_first_occurrences_across_chunks():
+    values = np.random.default_rng(1).integers(0, 2000, 20_000).astype(np.uint64)
+    seen = RowHashSet(track_positions=True)
+    first = np.concatenate([seen.add(chunk) for chunk in np.array_split(values, 37)])
+    expected_first = ~pd.Series(values).duplicated().to_numpy()
+    np.testing.assert_array_equal(first, expected_first)
+    assert len(seen) == len(np.unique(values))
+    # Runs are merged as they grow, so their number stays logarithmic.
+    assert len(seen._runs) <= int(np.log2(len(seen))) + 1
+
+    assert seen.contains(values).all()
+    assert not seen.contains(np.array([5000, 6000], dtype=np.uint64)).any()
+
+    order = pd.unique(values)
+    np.testing.assert_array_equal(seen.positions(order), np.arange(len(order)))
+    np.testing.assert_array_equal(seen.positions(np.array([9999], dtype=np.uint64)), [-1])
+
+
+def test_row_hash_set_positions_need_tracking():
+    seen = RowHashSet()
+    seen.add(np.array([1, 2], dtype=np.uint64))
+    with pytest.raises(ValueError):
+        seen.positions(np.array([1], dtype=np.uint64))
+
+
+def test_hyperloglog_estimate_is_within_error():
+    hll = HyperLogLog(precision=12)
+    distinct = 100_000
+    values = hash_rows(pd.DataFrame({"v": np.arange(distinct)}))
+    for chunk in np.array_split(values, 10):
+        hll.add(chunk)
+    hll.add(values[:5000])
+    assert abs(hll.estimate() - distinct) / distinct < 3 * hll.relative_error
+
+
+def test_hyperloglog_merge_equals_single_sketch():
+    values = hash_rows(pd.DataFrame({"v": np.arange(50_000)}))
+    whole, left, right = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    whole.add(values)
+    left.add(values[:20_000])
+    right.add(values[15_000:])
+    left.merge(right)
+    np.testing.assert_array_equal(left.registers, whole.registers)
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(11))
+
+
+@pytest.mark.parametrize("precision", [3, 19])
+def test_hyperloglog_rejects_precision_out_of_range(precision):
+    with pytest.raises(ValueError):
+        HyperLogLog(precision)
+
+
+def test_approximate_counter_is_close_to_exact():
+    df = pd.DataFrame({"v": np.arange(60_000) % 40_000})
+    counter = DuplicateCounter(approximate=True, precision=14)
+    for chunk in _chunks(df, 7000):
+        counter.add(hash_rows(chunk))
+    assert counter.total == 60_000
+    assert abs(counter.distinct - 40_000) / 40_000 < 3 * 1.04 / 2 ** 7
+    detection = counter.detection
+    assert detection["method"] == "approximate"
+    assert detection["distinct_relative_error"] == round(1.04 / 2 ** 7, 4)
+    assert abs(counter.duplicates - 20_000) <= 3 * detection["duplicates_error"]
+
+
+def test_approximate_duplicate_error_is_absolute_when_duplicates_are_few():
+    df = pd.DataFrame({"v": np.arange(50_000) % 49_990})
+    counter = DuplicateCounter(approximate=True, precision=12)
+    counter.add(hash_rows(df))
+    # Ten true duplicates: a relative bound on the duplicate count would be meaningless,
+    # the absolute one still covers the estimate.
+    error = counter.detection["duplicates_error"]
+    assert error >= 1.04 / 2 ** 6 * 49_000
+    assert abs(counter.duplicates - 10) <= 3 * error
+
+
+@pytest.mark.parametrize("load", [0.5, 1, 2, 2.5, 3, 4, 8])
+def test_hyperloglog_has_no_bias_between_estimators(load):
+    hll = HyperLogLog(precision=10)
+    distinct = int(load * len(hll.registers))
+    hll.add(hash_rows(pd.DataFrame({"v": np.arange(distinct)})))
+    assert abs(hll.estimate() - distinct) / distinct < 3 * hll.relative_error